@@ -0,0 +1,45 @@
+import time
+
+import pygame
+
+from src.app import App
+from src.background import BackgroundLayer
+
+FRAMES = 60
+FRAME_TIME = 1 / 60
+CONFIGS = (
+    ("direct", 1.0, 0),
+    ("cached", 1.0, 30),
+    ("cached", 0.5, 30),
+    ("cached", 0.5, 15),
+    ("cached", 0.25, 30),
+)
+
+
+def time_frames(app: App, layer: BackgroundLayer) -> float:
+    start = time.perf_counter()
+    for frame in range(FRAMES):
+        app.elapsed_time = frame * FRAME_TIME
+        app.update_uniforms()
+        app.ctx.new_frame()
+        layer.render(app.elapsed_time)
+        app.ctx.end_frame(sync=True)
+        pygame.display.flip()
+    return (time.perf_counter() - start) / FRAMES * 1000
+
+
+def main():
+    app = App(frame_budget_ms=0)
+    print(f"{'mode':>8} | {'scale':>5} | {'rate':>4} | frame time")
+    for mode, scale, update_rate in CONFIGS:
+        layer = BackgroundLayer(
+            app, app.uniform_buffer, mode=mode, scale=scale, update_rate=update_rate
+        )
+        app.background = layer
+        frame_time = time_frames(app, layer)
+        layer.release()
+        print(f"{mode:>8} | {scale:>5} | {update_rate:>4} | {frame_time:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
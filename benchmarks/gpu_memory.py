@@ -0,0 +1,27 @@
+import argparse
+
+from src.app import App
+
+SIZES = ("800x600", "1920x1080", "3840x2160")
+
+
+def parse_size(value: str) -> tuple[int, int]:
+    width, height = value.lower().split("x")
+    return int(width), int(height)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Report GPU memory per pipeline")
+    parser.add_argument("sizes", nargs="*", default=SIZES, metavar="WxH")
+    args = parser.parse_args()
+    for size in map(parse_size, args.sizes):
+        app = App(screen_size=size)
+        owners = {"uniforms": app.uniforms, "background": app.background}
+        owners.update((pipeline.name, pipeline) for pipeline in app.pipelines)
+        print(f"{size[0]}x{size[1]}")
+        for name, owned, shared in app.resources.report_rows(owners):
+            print(f"  {name:>14} | {owned:>10} | {shared:>10}")
+
+
+if __name__ == "__main__":
+    main()
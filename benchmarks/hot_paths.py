@@ -0,0 +1,198 @@
+import argparse
+from functools import partial
+import itertools
+import json
+import platform
+import random
+import sys
+import timeit
+
+import pygame
+
+from src.app import UNIFORM_FIELDS, App
+from src.headless import HeadlessApp
+from src.star_facts import STAR_FACTS
+from src.stars import Stars
+
+STAR_COUNTS = (25, 100, 1_000, 10_000, 100_000)
+CONSTELLATION_POINTS = (3, 5, 8)
+QUICK_STAR_COUNTS = (100, 10_000)
+QUICK_CONSTELLATION_POINTS = (4,)
+REPEAT = 3
+THRESHOLD = 0.25
+
+
+class HostBuffer:
+    # stands in for the uniform buffer, upload() copies the dirty span into it
+    def __init__(self, size: int):
+        self.data = bytearray(size)
+
+    def write(self, data, offset: int = 0):
+        data = memoryview(data).cast("B")
+        self.data[offset : offset + len(data)] = data
+
+
+def make_stars(
+    app: HeadlessApp, num_constellation_points: int, num_random_points: int
+) -> Stars:
+    game = app.game
+    return Stars(
+        app,
+        random.Random(0),
+        star_min_radius=game.star_min_radius,
+        star_max_radius=game.star_max_radius,
+        constellation_max_radius=game.start_constellation_max_radius,
+        max_constellation_points=num_constellation_points,
+        num_constellation_points=num_constellation_points,
+        num_random_points=num_random_points,
+        max_random_points=num_random_points,
+    )
+
+
+def time_call(func, repeat: int = REPEAT) -> float:
+    timer = timeit.Timer(func)
+    loops, _ = timer.autorange()
+    return min(timer.repeat(repeat, loops)) / loops * 1e6
+
+
+def uniform_cases(app: HeadlessApp):
+    stars = app.game.stars
+    uniforms = App.pack_uniforms(UNIFORM_FIELDS)
+    buffer = HostBuffer(uniforms.size)
+    frame = itertools.count()
+
+    def update_uniforms():
+        uniforms["iTime"] = next(frame) / 60
+        uniforms["iResolution"] = app.screen_size
+        uniforms["backgroundScale"] = (0.5, 0.5)
+        App.set_star_uniforms(uniforms, stars, stars.reference_offset)
+        uniforms.upload(buffer)
+
+    yield "pack_uniforms", lambda: App.pack_uniforms(UNIFORM_FIELDS)
+    yield "update_uniforms", update_uniforms
+
+
+def stars_cases(app: HeadlessApp, star_counts: tuple, point_counts: tuple):
+    for points, count in itertools.product(point_counts, star_counts):
+        yield f"stars_init[points={points},stars={count}]", partial(
+            make_stars, app, points, count
+        )
+    for points in point_counts:
+        stars = make_stars(app, points, 25)
+        yield f"get_rect_from_points[points={points}]", partial(
+            stars.get_rect_from_points, stars.reference_points
+        )
+        yield f"move_and_scale_points[points={points}]", partial(
+            stars.move_and_scale_points, stars.reference_points, (400, 300), 1
+        )
+        yield f"reference_instances[points={points}]", stars.init_reference_instances
+        yield f"shapes_are_matched[points={points}]", stars.shapes_are_matched
+    for count in star_counts:
+        stars = make_stars(app, 4, count)
+        yield f"init_all_stars[stars={count}]", stars.init_all_stars
+
+
+def gui_cases(app: HeadlessApp):
+    gui = app.game.gui
+    screen = pygame.Surface(app.screen_size, pygame.SRCALPHA)
+    facts = itertools.cycle(STAR_FACTS)
+
+    def render_fact():
+        # a level shows a fact once, so measure it with cold text caches
+        gui.text.layouts.clear()
+        gui.text.surfs.clear()
+        gui.render_fact(next(facts))
+
+    def hud_instance_data():
+        gui.hud_items = None
+        gui.update_hud()
+
+    def draw_scene():
+        gui.scene_state = None
+        app.game.draw(screen)
+
+    yield "gui_draw", lambda: gui.draw(screen)
+    yield "render_fact", render_fact
+    yield "hud_instance_data", hud_instance_data
+    yield "game_draw", draw_scene
+
+
+def run_benchmarks(star_counts: tuple, point_counts: tuple, repeat: int) -> dict:
+    app = HeadlessApp(seed=0)
+    app.step()
+    cases = itertools.chain(
+        uniform_cases(app),
+        stars_cases(app, star_counts, point_counts),
+        gui_cases(app),
+    )
+    results = {}
+    for name, func in cases:
+        results[name] = time_call(func, repeat)
+        print(f"{name:<42} {results[name]:>12.2f} us", flush=True)
+    return results
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> list[str]:
+    regressions = []
+    print(f"\n{'benchmark':<42} {'us':>12} {'baseline':>12} {'change':>8}")
+    for name, value in results.items():
+        if name not in baseline:
+            continue
+        change = value / baseline[name] - 1
+        flag = ""
+        if change > threshold:
+            regressions.append(name)
+            flag = " REGRESSED"
+        print(
+            f"{name:<42} {value:>12.2f} {baseline[name]:>12.2f} {change:>+8.1%}{flag}"
+        )
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Time the per-frame and per-level Python paths without a display"
+    )
+    parser.add_argument("--output", metavar="PATH", help="save results as JSON")
+    parser.add_argument(
+        "--baseline", metavar="PATH", help="compare against saved JSON results"
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=THRESHOLD,
+        help="fail when a benchmark is this much slower than the baseline",
+    )
+    parser.add_argument("--repeat", type=int, default=REPEAT)
+    parser.add_argument(
+        "--quick", action="store_true", help="run a smaller parameter sweep"
+    )
+    args = parser.parse_args()
+
+    results = run_benchmarks(
+        QUICK_STAR_COUNTS if args.quick else STAR_COUNTS,
+        QUICK_CONSTELLATION_POINTS if args.quick else CONSTELLATION_POINTS,
+        args.repeat,
+    )
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(
+                {
+                    "python": platform.python_version(),
+                    "pygame": pygame.version.ver,
+                    "results": results,
+                },
+                f,
+                indent=2,
+            )
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)["results"]
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} regressed by over {args.threshold:.0%}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+import random
+import struct
+import time
+
+import pygame
+
+from src.app import App
+from src.shader_pipeline import ShaderPipeline
+from src.stars import RANDOM_STAR
+
+STAR_COUNTS = (100, 1000, 10000)
+FRAMES = 30
+VERT_SHADER_IDS = {"full-screen": "constellation", "sprite": "star_sprite"}
+
+
+def make_star_pipeline(app: App, vert_shader_id: str, max_stars: int):
+    return ShaderPipeline(
+        app,
+        app.uniform_buffer,
+        vert_shader_id=vert_shader_id,
+        frag_shader_id="stars",
+        has_tex=False,
+        instance_buffer_size=max_stars * 16,
+        instance_buffer_layout=("2f 1f 1f /i", 0, 1, 2),
+        blend={"enable": True, "src_color": "one", "dst_color": "one_minus_src_alpha"},
+    )
+
+
+def random_instance_data(app: App, num_stars: int) -> bytes:
+    values = []
+    for _ in range(num_stars):
+        values += (
+            random.uniform(0, app.screen_w),
+            random.uniform(0, app.screen_h),
+            random.uniform(0.0005, 0.015),
+            RANDOM_STAR,
+        )
+    return struct.pack("f" * len(values), *values)
+
+
+def time_frames(app: App, pipeline: ShaderPipeline, num_stars: int) -> float:
+    instance_data = random_instance_data(app, num_stars)
+    start = time.perf_counter()
+    for _ in range(FRAMES):
+        app.elapsed_time = pygame.time.get_ticks() / 1000.0
+        app.update_uniforms()
+        app.ctx.new_frame()
+        pipeline.render(instance_data=instance_data, instance_count=num_stars)
+        app.ctx.end_frame(sync=True)
+        pygame.display.flip()
+    return (time.perf_counter() - start) / FRAMES * 1000
+
+
+def main():
+    random.seed(0)
+    app = App()
+    app.elapsed_time = 0.0
+    results = {}
+    for mode, vert_shader_id in VERT_SHADER_IDS.items():
+        pipeline = make_star_pipeline(app, vert_shader_id, max(STAR_COUNTS))
+        for num_stars in STAR_COUNTS:
+            results[mode, num_stars] = time_frames(app, pipeline, num_stars)
+
+    print(f"{'stars':>8} | " + " | ".join(f"{mode:>12}" for mode in VERT_SHADER_IDS))
+    for num_stars in STAR_COUNTS:
+        row = " | ".join(
+            f"{results[mode, num_stars]:>9.2f} ms" for mode in VERT_SHADER_IDS
+        )
+        print(f"{num_stars:>8} | {row}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+RUNS = 3
+# where Mesa and the NVIDIA driver keep compiled shaders between launches
+CACHE_ENV = ("MESA_SHADER_CACHE_DIR", "__GL_SHADER_DISK_CACHE_PATH")
+
+
+def first_frame():
+    from src.app import App
+
+    app = App()
+    app.elapsed_time = app.get_ticks() / 1000.0
+    app.game.update()
+    app.render(app.game.draw(app.screen))
+    app.ctx.end_frame(sync=True)
+    print(json.dumps(app.shaders.compile_ms), flush=True)
+
+
+def time_launch(env: dict) -> tuple[float, dict]:
+    start = time.perf_counter()
+    child = subprocess.Popen(
+        [sys.executable, "-m", "benchmarks.startup", "--child"],
+        env=env,
+        stdout=subprocess.PIPE,
+        text=True,
+    )
+    compile_ms = json.loads(child.stdout.readline())
+    elapsed = (time.perf_counter() - start) * 1000
+    child.wait()
+    return elapsed, compile_ms
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Time from process start to the first presented frame"
+    )
+    parser.add_argument("--runs", type=int, default=RUNS, help="warm launches")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.child:
+        first_frame()
+        return
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        # a fresh shader cache makes the first launch cold
+        env = {**os.environ, **dict.fromkeys(CACHE_ENV, cache_dir)}
+        env["PYGAME_HIDE_SUPPORT_PROMPT"] = "1"
+        launches = [("cold", *time_launch(env))]
+        launches += [("warm", *time_launch(env)) for _ in range(args.runs)]
+
+    names = list(launches[0][2])
+    print(f"{'launch':>6} | {'first frame':>11} | " + " | ".join(names))
+    for launch, elapsed, compile_ms in launches:
+        cells = " | ".join(f"{compile_ms[name]:>{len(name)}.2f}" for name in names)
+        print(f"{launch:>6} | {elapsed:>8.0f} ms | {cells}")
+
+
+if __name__ == "__main__":
+    main()
@@ -5,11 +5,106 @@
 # ]
 # ///
 
+import argparse
 import asyncio
 
+import src.constants as constants
 from src.app import App
 
-
 if __name__ == "__main__":
-    app = App()
+    parser = argparse.ArgumentParser(description="Constellations")
+    parser.add_argument(
+        "--profile-dump",
+        metavar="PATH",
+        help="write per-frame stage timings to a .csv or .json file on exit",
+    )
+    parser.add_argument(
+        "--record",
+        metavar="PATH",
+        help="record the seed and input of this session to PATH",
+    )
+    parser.add_argument(
+        "--replay",
+        metavar="PATH",
+        help="replay a recorded session and print frame timings on exit",
+    )
+    parser.add_argument(
+        "--seed",
+        type=int,
+        help="seed level generation (recorded with --record, ignored with --replay"
+        " and --daily)",
+    )
+    parser.add_argument(
+        "--level-pack",
+        metavar="PATH",
+        help="play the levels of a pack built by tools/build_level_pack.py",
+    )
+    parser.add_argument(
+        "--daily",
+        action="store_true",
+        help="play today's campaign, from its level pack when one has been built",
+    )
+    parser.add_argument(
+        "--size",
+        metavar="WxH",
+        type=lambda value: tuple(int(n) for n in value.lower().split("x")),
+        default=constants.SCREEN_SIZE,
+        help="window size, default %(default)s",
+    )
+    parser.add_argument(
+        "--frame-budget",
+        metavar="MS",
+        type=float,
+        default=constants.FRAME_BUDGET_MS,
+        help="frame time the background resolution adapts to, 0 keeps it fixed",
+    )
+    parser.add_argument(
+        "--fps",
+        type=float,
+        default=constants.FPS_CAP,
+        help="frame rate cap, 0 uncaps, default %(default)s",
+    )
+    parser.add_argument(
+        "--idle-fps",
+        type=float,
+        default=constants.IDLE_FPS,
+        help="frame rate while waiting on the fact screen, 0 disables",
+    )
+    parser.add_argument(
+        "--sim-rate",
+        metavar="HZ",
+        type=float,
+        default=constants.SIM_RATE,
+        help="run game logic at a fixed rate, 0 updates once per frame",
+    )
+    parser.add_argument(
+        "--no-vsync", action="store_true", help="do not wait for the display refresh"
+    )
+    parser.add_argument(
+        "--dev",
+        action="store_true",
+        help="reload shaders from src/shaders when they change on disk",
+    )
+    parser.add_argument(
+        "--startup-timeline",
+        action="store_true",
+        help="print what startup spent its time on once the first frame is shown",
+    )
+    args = parser.parse_args()
+    app = App(
+        screen_size=args.size,
+        frame_budget_ms=args.frame_budget,
+        fps_cap=args.fps,
+        idle_fps=args.idle_fps,
+        sim_rate=args.sim_rate,
+        vsync=constants.VSYNC and not args.no_vsync,
+        profile_dump_path=args.profile_dump,
+        record_path=args.record,
+        replay_path=args.replay,
+        seed=args.seed,
+        level_pack_path=args.level_pack,
+        daily=args.daily,
+        dev=args.dev,
+        startup_timeline=args.startup_timeline,
+    )
     asyncio.run(app.run())
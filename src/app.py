@@ -1,167 +1,524 @@
-import asyncio
-import struct
+import datetime
+import os
+import time
 
 import pygame
 import zengl
 
 import src.constants as constants
+from src.assets import AssetManager, DeferredSound
+from src.background import BackgroundLayer
+from src.dynamic_resolution import DynamicResolution
+from src.fixed_timestep import FixedTimestep
+from src.frame_scheduler import FrameScheduler
 from src.game import Game
+from src.input import InputHandler
+from src.level_pack import LevelPack, daily_pack_path, daily_seed
+from src.profiler import FrameProfiler
+from src.resources import ResourcePool
+from src.replay import InputRecorder, InputReplayer
+from src.shader_manager import ShaderManager
 from src.shader_pipeline import ShaderPipeline
+from src.shader_reloader import ShaderReloader
+from src.starfield import FLOATS_PER_STAR, MAX_STAR_ATTEMPTS, RANDOM_STAR_BRIGHTNESS
+from src.stars import (
+    CONSTELLATION_STAR,
+    FLOATS_PER_REFERENCE_SEGMENT,
+    RANDOM_STAR,
+    REFERENCE_FILL,
+    REFERENCE_FILL_COLOUR,
+    REFERENCE_LINE,
+    REFERENCE_LINE_WIDTH,
+    Stars,
+)
+from src.text import FLOATS_PER_GLYPH
+from src.uniforms import UniformBlock
+
+TEXT_GLYPHS = 1024
+
+UNIFORM_FIELDS = {
+    "iTime": "float",
+    "numRandomStars": "int",
+    "constellationRect": "vec4",
+    "iResolution": "vec2",
+    "backgroundScale": "vec2",
+    "starSeed": "uint",
+    "starArea": "ivec4",
+    "excludeRects": "ivec4[2]",
+    "referenceOffset": "vec2",
+}
 
 
 class App:
-    def __init__(self):
-        self.screen_size = self.screen_w, self.screen_h = constants.SCREEN_SIZE
-        pygame.init()
-        self.screen = pygame.display.set_mode(
-            self.screen_size, pygame.OPENGL | pygame.DOUBLEBUF
-        ).convert_alpha()
+    headless = False
+
+    def __init__(
+        self,
+        screen_size: tuple[int, int] = constants.SCREEN_SIZE,
+        frame_budget_ms: float = constants.FRAME_BUDGET_MS,
+        fps_cap: float = constants.FPS_CAP,
+        idle_fps: float = constants.IDLE_FPS,
+        sim_rate: float = constants.SIM_RATE,
+        vsync: bool = constants.VSYNC,
+        profile_dump_path: str | None = None,
+        record_path: str | None = None,
+        replay_path: str | None = None,
+        seed: int | None = None,
+        level_pack_path: str | None = None,
+        daily: bool = False,
+        dev: bool = False,
+        startup_timeline: bool = False,
+    ):
+        self.assets = AssetManager()
+        self.startup_timeline = startup_timeline
+        self.screen_size = self.screen_w, self.screen_h = screen_size
+        self.profiler = FrameProfiler(dump_path=profile_dump_path)
+        with self.assets.span("pygame.init"):
+            pygame.init()
+        # decode audio while the window, game and shaders are set up
+        self.assets.load_sound(constants.CONST_COMPLETE_SOUND_PATH)
+        self.assets.load_music(constants.MUSIC_PATH)
+        with self.assets.span("display"):
+            self.screen, vsync = self.init_display(vsync)
+        self.input = InputHandler()
+        self.input.allow_input_events()
         self.ctx = zengl.context()
+        self.resources = ResourcePool(self.ctx)
+        self.shaders = ShaderManager(self.ctx)
+        self.profiler.init_gpu_timer()
         pygame.display.set_caption("Constellations")
         self.clock = pygame.time.Clock()
-        self.game = Game(self)
-        self.game.reset_level()
-        self.game.init_level()
-        uniforms_map = {
-            "iTime": {
-                "value": lambda: struct.pack("f", self.elapsed_time),
-                "glsl_type": "float",
-            },
-            "numRandomStars": {
-                "value": lambda: struct.pack("i", self.game.stars.num_random_points),
-                "glsl_type": "int",
-            },
-            "constellationRect": {
-                "value": lambda: struct.pack(
-                    "ffff", *self.game.stars.constellation_rect
-                ),
-                "glsl_type": "vec4",
-            },
-        }
-        self.uniforms, self.ufs_size, self.ufs_includes = self.pack_uniforms(
-            uniforms_map
+        self.ticks = pygame.time.get_ticks()
+        self.mouse_pos = (0, 0)
+        self.replayer = InputReplayer(replay_path) if replay_path else None
+        if self.replayer:
+            # replays run as fast as possible so frame times can be compared
+            fps_cap = idle_fps = 0
+        self.scheduler = FrameScheduler(
+            fps_cap=fps_cap,
+            idle_fps=idle_fps,
+            vsync=vsync,
+            refresh_rate=pygame.display.get_current_refresh_rate(),
+        )
+        if daily:
+            today = datetime.date.today()
+            seed = daily_seed(today)
+            if os.path.exists(daily_pack_path(today)):
+                level_pack_path = daily_pack_path(today)
+            else:
+                print(f"{daily_pack_path(today)} not found, generating levels live")
+        level_pack = None
+        if level_pack_path:
+            level_pack = LevelPack(level_pack_path)
+            level_pack.check(
+                self.screen_size, constants.DENSE_SKY_STARS, constants.PROCEDURAL_STARS
+            )
+        self.recorder = None
+        if self.replayer:
+            seed = self.replayer.seed
+            self.ticks = self.replayer.start_ticks
+        elif record_path:
+            seed = int(time.time()) if seed is None else seed
+            self.recorder = InputRecorder(record_path, seed, self.ticks)
+        self.frame_times = []
+        self.timestep = FixedTimestep(sim_rate) if sim_rate else None
+        self.sim_events = []
+        self.previous_reference = None
+        with self.assets.span("game"):
+            self.game = Game(self)
+            self.game.seed = seed
+            self.game.level_pack = level_pack
+            self.game.reset_level()
+            self.game.init_level()
+        shaders_start = self.assets.elapsed_ms()
+        self.uniforms = self.pack_uniforms(UNIFORM_FIELDS)
+        self.uniform_buffer = self.resources.buffer(self.uniforms, self.uniforms.size)
+        self.ctx.includes["uniforms"] = self.uniforms.glsl_source
+        self.background = BackgroundLayer(
+            self,
+            self.uniform_buffer,
+            mode=constants.BACKGROUND_MODE,
+            scale=constants.BACKGROUND_SCALE,
+            update_rate=constants.BACKGROUND_FPS,
         )
-        self.uniform_buffer = self.ctx.buffer(size=self.ufs_size)
-        self.ctx.includes["uniforms"] = self.ufs_includes["uniforms"]
-        vec2_screen_size_str = f"vec2({self.screen_size[0]}.0, {self.screen_size[1]}.0)"
-        self.ctx.includes["iResolution"] = (
-            f"const vec2 iResolution = {vec2_screen_size_str};"
+        self.dynamic_resolution = None
+        if frame_budget_ms and self.background.mode == "cached":
+            self.dynamic_resolution = DynamicResolution(
+                self.background,
+                frame_budget_ms,
+                min_scale=constants.BACKGROUND_MIN_SCALE,
+            )
+            self.profiler.keep_gpu_timing = vsync
+        star_vert_shader_id = (
+            "star_sprite" if constants.STAR_SPRITES else "constellation"
         )
-        self.space_bg_shader = ShaderPipeline(
-            self, self.uniform_buffer, frag_shader_id="space_bg", has_tex=False
+        self.ctx.includes["starRadius"] = (
+            f"const int CONSTELLATION_STAR = {CONSTELLATION_STAR};\n"
+            f"const int RANDOM_STAR = {RANDOM_STAR};\n"
+            "const float STAR_RADIUS_SCALE[2] = float[2](15.25, 25.25);"
         )
-        self.aurora_shader = ShaderPipeline(
-            self, self.uniform_buffer, frag_shader_id="aurora", has_tex=False
+        low, high = RANDOM_STAR_BRIGHTNESS
+        self.ctx.includes["proceduralStars"] = (
+            f"const uint MAX_STAR_ATTEMPTS = {MAX_STAR_ATTEMPTS}u;\n"
+            f"const vec2 RANDOM_STAR_BRIGHTNESS = vec2({low}, {high - low});"
         )
-        self.constellation_shader = ShaderPipeline(
+        max_stars = self.game.max_constellation_points
+        if not constants.PROCEDURAL_STARS:
+            max_stars += self.game.max_random_points
+        self.stars_shader = ShaderPipeline(
             self,
             self.uniform_buffer,
-            vert_shader_id="constellation",
-            frag_shader_id="constellation",
+            vert_shader_id=star_vert_shader_id,
+            frag_shader_id="stars",
             has_tex=False,
-            instance_buffer_size=64000,
-            instance_buffer_layout=("2f 1f /i", 0, 1),
-            blend={"enable": True, "src_color": "one", "dst_color": "one"},
+            instance_buffer_size=max_stars * FLOATS_PER_STAR * 4,
+            instance_buffer_layout=("2f 1f 1f /i", 0, 1, 2),
+            blend={
+                "enable": True,
+                "src_color": "one",
+                "dst_color": "one_minus_src_alpha",
+            },
+        )
+        self.procedural_stars_shader = None
+        if constants.PROCEDURAL_STARS:
+            self.procedural_stars_shader = ShaderPipeline(
+                self,
+                self.uniform_buffer,
+                vert_shader_id="procedural_stars",
+                frag_shader_id="stars",
+                has_tex=False,
+                name="procedural_stars",
+                blend=self.stars_shader.blend,
+            )
+        self.screen_shader = ShaderPipeline(self, self.uniform_buffer, name="screen")
+        fill_colour = self.glsl_colour(REFERENCE_FILL_COLOUR)
+        line_colour = self.glsl_colour(constants.RED)
+        self.ctx.includes["referenceShape"] = (
+            f"const int REFERENCE_FILL = {REFERENCE_FILL};\n"
+            f"const int REFERENCE_LINE = {REFERENCE_LINE};\n"
+            f"const float REFERENCE_LINE_WIDTH = {float(REFERENCE_LINE_WIDTH)};\n"
+            f"const vec4 REFERENCE_FILL_COLOR = {fill_colour};\n"
+            f"const vec4 REFERENCE_LINE_COLOR = {line_colour};"
         )
-        self.random_stars_shader = ShaderPipeline(
+        max_segments = 2 * self.game.max_constellation_points
+        self.reference_shader = ShaderPipeline(
             self,
             self.uniform_buffer,
-            vert_shader_id="constellation",
-            frag_shader_id="random_stars",
+            vert_shader_id="reference",
+            frag_shader_id="reference",
             has_tex=False,
-            instance_buffer_size=64000,
-            instance_buffer_layout=("2f 1f /i", 0, 1),
+            instance_buffer_size=max_segments * FLOATS_PER_REFERENCE_SEGMENT * 4,
+            instance_buffer_layout=("4f 1f /i", 0, 1),
+        )
+        self.text_shader = ShaderPipeline(
+            self,
+            self.uniform_buffer,
+            vert_shader_id="text",
+            frag_shader_id="text",
+            image_size=self.game.gui.text.atlas.size,
+            image_tag="text_atlas",
+            # room for the usual glyph count, the buffer grows past it
+            instance_buffer_size=TEXT_GLYPHS * FLOATS_PER_GLYPH * 4,
+            instance_buffer_layout=("4f 4f 4f /i", 0, 1, 2),
         )
-        self.screen_shader = ShaderPipeline(self, self.uniform_buffer)
-        pygame.mixer.music.load(constants.MUSIC_PATH)
+        self.profiler_text_shader = ShaderPipeline(
+            self,
+            self.uniform_buffer,
+            vert_shader_id="text",
+            frag_shader_id="text",
+            image_size=self.game.gui.text.atlas.size,
+            image_tag="text_atlas",
+            instance_buffer_size=TEXT_GLYPHS * FLOATS_PER_GLYPH * 4,
+            instance_buffer_layout=("4f 4f 4f /i", 0, 1, 2),
+            name="profiler_text",
+        )
+        self.text_atlas_version = None
+        self.profiler_rows = None
+        self.profiler_instance_data = None
+        self.pipelines = (
+            *self.background.pipelines,
+            self.stars_shader,
+            self.screen_shader,
+            self.reference_shader,
+            self.text_shader,
+            self.profiler_text_shader,
+        )
+        if self.procedural_stars_shader:
+            self.pipelines += (self.procedural_stars_shader,)
+        self.profiler.record_time("shader_compile", self.shaders.total_compile_ms)
+        self.assets.record("shaders", shaders_start)
+        self.shader_reloader = ShaderReloader(self) if dev else None
+        self.frame_bytes_uploaded = 0
         self.running = True
 
-    def render(self):
-        self.update_uniforms()
+    def init_display(self, vsync: bool) -> tuple[pygame.Surface, bool]:
+        flags = pygame.OPENGL | pygame.DOUBLEBUF
+        if vsync:
+            try:
+                screen = pygame.display.set_mode(self.screen_size, flags, vsync=1)
+                return screen.convert_alpha(), True
+            except pygame.error:
+                pass
+        screen = pygame.display.set_mode(self.screen_size, flags)
+        return screen.convert_alpha(), False
+
+    def render(self, dirty_rects: list[pygame.Rect] | None = None):
+        with self.profiler.stage("uniforms"):
+            self.update_uniforms()
         self.ctx.new_frame()
 
-        self.aurora_shader.render()
-        self.space_bg_shader.render()
+        self.background.render(self.elapsed_time)
 
-        points = self.game.stars.const_points_and_brightnesses
-        num_points = len(points) * 3
-        self.constellation_shader.render(
-            instance_data=struct.pack(
-                "f" * num_points, *[item for sublist in points for item in sublist]
-            ),
-            instance_count=num_points // 3,
+        stars = self.game.stars
+        self.stars_shader.render(
+            instance_data=stars.instance_data, instance_count=stars.num_stars
         )
+        if self.procedural_stars_shader:
+            self.procedural_stars_shader.render(instance_count=stars.num_random_points)
 
-        rand_points = self.game.stars.rand_points_and_brightnesses
-        num_rand_points = len(rand_points) * 3
-        self.random_stars_shader.render(
-            instance_data=struct.pack(
-                "f" * num_rand_points,
-                *[item for sublist in rand_points for item in sublist],
-            ),
-            instance_count=num_rand_points // 3,
+        self.screen_shader.render(self.screen, dirty_rects=dirty_rects)
+        game = self.game
+        if not (game.show_fact or game.game_complete):
+            self.reference_shader.render(
+                instance_data=stars.reference_instance_data,
+                instance_count=stars.reference_instance_count,
+            )
+        self.render_text()
+        with self.profiler.stage("flip"):
+            self.ctx.end_frame()
+            pygame.display.flip()
+        self.frame_bytes_uploaded = self.uniform_bytes_uploaded + sum(
+            pipeline.bytes_uploaded for pipeline in self.pipelines
         )
+        self.profiler.count("bytes_uploaded", self.frame_bytes_uploaded)
 
-        self.screen_shader.render(self.screen)
-        self.ctx.end_frame()
-        pygame.display.flip()
+    def render_text(self):
+        gui = self.game.gui
+        atlas = gui.text.atlas
+        if self.profiler.visible:
+            self.update_profiler_text()
+        atlas_surf = None
+        with gui.text.lock:
+            if atlas.version != self.text_atlas_version:
+                atlas_surf = atlas.surf
+                self.text_atlas_version = atlas.version
+            self.text_shader.render(
+                atlas_surf,
+                instance_data=gui.hud_instance_data,
+                instance_count=gui.hud_glyph_count,
+            )
+        if self.profiler.visible:
+            self.profiler_text_shader.render(
+                instance_data=self.profiler_instance_data,
+                instance_count=len(self.profiler_instance_data) // FLOATS_PER_GLYPH,
+            )
+
+    def update_profiler_text(self):
+        rows = self.profiler.overlay_rows
+        if rows is self.profiler_rows:
+            return
+        self.profiler_rows = rows
+        text = self.game.gui.text
+        font_size = self.screen_w // 60
+        line_h = text.atlas.get_font(font_size).get_linesize()
+        column_xs = (self.screen_w // 100, self.screen_w // 5, self.screen_w // 2)
+        self.profiler_instance_data = text.instance_data(
+            [
+                (
+                    cell,
+                    font_size,
+                    constants.LIGHT_GREEN,
+                    (x, line_h * (row_index + 1)),
+                    0,
+                )
+                for row_index, row in enumerate(rows)
+                for x, cell in zip(column_xs, row)
+            ]
+        )
+
+    def poll_events(self) -> list[pygame.event.Event]:
+        events = self.input.poll()
+        if self.replayer:
+            frame = self.replayer.next_frame()
+            if frame is None:
+                self.running = False
+                return events
+            self.ticks, self.mouse_pos = frame.ticks, frame.mouse_pos
+            live_events = [
+                event for event in events if event.type in (pygame.QUIT, pygame.KEYDOWN)
+            ]
+            events = frame.events + live_events
+        else:
+            self.ticks = pygame.time.get_ticks()
+            self.mouse_pos = pygame.mouse.get_pos()
+            if self.recorder:
+                self.recorder.record_frame(self.ticks, self.mouse_pos, events)
+        self.input.received(events)
+        return events
 
     async def run(self):
         while self.running:
-            self.elapsed_time = pygame.time.get_ticks() / 1000.0
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT or (
-                    event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE
-                ):
-                    self.running = False
+            frame_start = time.perf_counter()
+            events = self.poll_events()
+            if not self.running:
+                break
+            self.elapsed_time = self.get_ticks() / 1000.0
+            self.scheduler.notify_input(events)
+            with self.profiler.stage("events"):
+                for event in events:
+                    if event.type == pygame.QUIT or (
+                        event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE
+                    ):
+                        self.running = False
+                    elif event.type == pygame.KEYDOWN and event.key == pygame.K_F3:
+                        self.profiler.toggle()
+                    if self.timestep:
+                        self.sim_events.append(event)
+                    else:
+                        self.game.handle_events(event)
+            with self.profiler.stage("update"):
+                if self.timestep:
+                    self.step_simulation()
+                else:
+                    self.game.update()
+            if self.game.transition_ms is not None:
+                self.profiler.record_time("level_transition", self.game.transition_ms)
+                self.game.transition_ms = None
+            with self.profiler.stage("draw"):
+                dirty_rects = self.game.draw(self.screen)
+            self.render(dirty_rects)
+            # fixed steps may not have consumed this frame's input yet
+            if not self.sim_events:
+                latency_ms = self.input.presented()
+                if latency_ms is not None:
+                    self.profiler.record_time("input_latency", latency_ms)
+            self.profiler.count("coalesced_events", self.input.coalesced_count)
+            frame_ms = (time.perf_counter() - frame_start) * 1000
+            if not self.frame_times:
+                self.first_frame_presented()
+            self.frame_times.append(frame_ms)
+            if self.dynamic_resolution:
+                self.dynamic_resolution.update(self.frame_cost_ms(frame_ms))
+            self.profiler.count(
+                "background_scale_pct", round(self.background.scale * 100)
+            )
+            self.profiler.record_time("interval", self.scheduler.interval_ms)
+            self.profiler.record_time("jitter", self.scheduler.jitter_ms)
+            self.clock.tick()
+            self.profiler.end_frame()
+            if self.shader_reloader:
+                self.shader_reloader.update()
+            await self.scheduler.wait(
+                self.scheduler.is_idle(self.game.show_fact or self.game.game_complete)
+            )
+        self.profiler.dump()
+        if self.recorder:
+            self.recorder.close()
+        if self.replayer:
+            self.print_replay_summary()
+
+    def step_simulation(self):
+        frame_ticks = self.ticks
+        steps = self.timestep.advance(frame_ticks)
+        for _ in range(steps):
+            stars = self.game.stars
+            self.previous_reference = (stars, stars.reference_rect.topleft)
+            # the game sees the time of the step, not of the frame
+            self.ticks = self.timestep.step()
+            for event in self.sim_events:
                 self.game.handle_events(event)
+            self.sim_events = []
             self.game.update()
-            self.game.draw(self.screen)
-            self.render()
-            self.clock.tick()
-            await asyncio.sleep(0)
+        self.ticks = frame_ticks
+        self.profiler.count("sim_steps", steps)
+
+    def reference_offset(self) -> tuple[float, float]:
+        stars = self.game.stars
+        offset = stars.reference_offset
+        if not self.timestep or self.previous_reference is None:
+            return offset
+        previous_stars, (previous_x, previous_y) = self.previous_reference
+        if previous_stars is not stars:
+            return offset
+        # draw the reference between the last two steps
+        alpha = self.timestep.alpha
+        x, y = stars.reference_rect.topleft
+        return (
+            offset[0] + (previous_x - x) * (1 - alpha),
+            offset[1] + (previous_y - y) * (1 - alpha),
+        )
+
+    def first_frame_presented(self):
+        self.assets.mark("first frame")
+        self.profiler.record_time("startup", self.assets.elapsed_ms())
+        if self.startup_timeline:
+            for name, thread, start, end in self.assets.report_rows():
+                print(f"{name:<32} | {thread:<14} | {start:>8} | {end:>8}")
+            print()
+            for name, compile_ms in self.shaders.report_rows():
+                print(f"{name:<32} | {compile_ms:>10}")
+
+    def frame_cost_ms(self, frame_ms: float) -> float:
+        if not self.scheduler.vsync:
+            return frame_ms
+        # with vsync, flip also waits for the display, so count the CPU work
+        # outside of it and the GPU time of the passes instead
+        cpu_ms = frame_ms - self.profiler.frame_stage_ms("flip")
+        return max(cpu_ms, self.profiler.last_gpu_frame_ms or 0)
+
+    def print_replay_summary(self):
+        if not self.frame_times:
+            return
+        ordered = sorted(self.frame_times)
+        total = sum(ordered)
+        print(f"replayed frames: {len(ordered)}")
+        print(f"levels: {self.game.levels_generated}")
+        print(f"total: {total:.1f} ms")
+        print(f"mean: {total / len(ordered):.2f} ms")
+        print(f"p95: {ordered[round((len(ordered) - 1) * 0.95)]:.2f} ms")
+        latencies = sorted(self.input.latencies)
+        if latencies:
+            print(
+                f"input latency p95: {latencies[round((len(latencies) - 1) * 0.95)]:.2f} ms"
+            )
+
+    def get_ticks(self) -> int:
+        return self.ticks
+
+    def get_mouse_pos(self) -> tuple[int, int]:
+        return self.mouse_pos
+
+    def load_sound(self, path: str) -> DeferredSound:
+        return self.assets.sound(path)
+
+    def play_music(self):
+        self.assets.music(constants.MUSIC_PATH)
+        pygame.mixer.music.play(-1)
 
     def update_uniforms(self):
-        for uniform in self.uniforms.values():
-            self.uniform_buffer.write(uniform["value"](), offset=uniform["offset"])
+        self.uniforms["iTime"] = self.elapsed_time
+        self.uniforms["iResolution"] = self.screen_size
+        self.uniforms["backgroundScale"] = self.background.uv_scale
+        self.set_star_uniforms(self.uniforms, self.game.stars, self.reference_offset())
+        self.uniform_bytes_uploaded = self.uniforms.upload(self.uniform_buffer)
 
     @staticmethod
-    def pack_uniforms(uniforms_map: dict) -> tuple[dict, int, dict]:
-        uniforms = {}
-        layout = ""
-        offset = 0
-        for uf_name, uf_data in uniforms_map.items():
-            if uf_data["glsl_type"] == "float":
-                size = 4  # Size of a float in bytes
-                align = 4
-            elif uf_data["glsl_type"] == "int":
-                size = 4
-                align = 4
-            elif uf_data["glsl_type"] == "vec2":
-                size = 8  # 2 floats
-                align = 8
-            elif uf_data["glsl_type"] == "vec3":
-                size = 12  # 3 floats, but aligned as vec4 in std140 layout
-                align = 16
-            elif uf_data["glsl_type"] == "vec4":
-                size = 16  # 4 floats
-                align = 16
-            elif uf_data["glsl_type"] == "mat4":
-                size = 64  # 4x4 floats
-                align = 16  # aligned as vec4 in std140 layout
-            else:
-                raise ValueError(f"Unknown GLSL type: {uf_data['glsl_type']}")
-
-            # Add padding for alignment
-            if offset % align != 0:
-                offset += align - (offset % align)
+    def set_star_uniforms(
+        uniforms: UniformBlock, stars: Stars, reference_offset: tuple[float, float]
+    ):
+        uniforms["numRandomStars"] = stars.num_random_points
+        uniforms["constellationRect"] = stars.constellation_rect
+        uniforms["starSeed"] = stars.star_seed
+        uniforms["starArea"] = stars.star_area
+        for index, rect in enumerate(stars.star_exclude):
+            uniforms[f"excludeRects[{index}]"] = (*rect.topleft, *rect.bottomright)
+        uniforms["referenceOffset"] = reference_offset
 
-            uniforms[uf_name] = {"value": uf_data["value"], "offset": offset}
-            offset += size
-            layout += f"{uf_data['glsl_type']} {uf_name};\n"
+    @staticmethod
+    def glsl_colour(colour: tuple) -> str:
+        channels = (*colour, 255)[:4]
+        return f"vec4({', '.join(f'{value / 255:.4f}' for value in channels)})"
 
-        includes = f"""
-                layout (std140) uniform Common {{{layout if uniforms else 'float dummy;'}}};
-            """
-        buffer_size = 16 + offset
-        return uniforms, buffer_size, {"uniforms": includes.strip()}
+    @staticmethod
+    def pack_uniforms(uniforms_map: dict) -> UniformBlock:
+        return UniformBlock(uniforms_map)
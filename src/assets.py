@@ -0,0 +1,107 @@
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
+import os
+import sys
+import threading
+import time
+
+import pygame
+
+
+class DeferredSound:
+    def __init__(self, assets: "AssetManager", path: str):
+        self.assets = assets
+        self.path = path
+
+    def play(self):
+        self.assets.get(("sound", self.path)).play()
+
+
+class AssetManager:
+    def __init__(self, threaded: bool = True):
+        self.start_time = time.perf_counter()
+        # pygbag has no threads, so assets are loaded the first time they are used
+        self.executor = (
+            ThreadPoolExecutor(max_workers=2, thread_name_prefix="assets")
+            if threaded and sys.platform != "emscripten"
+            else None
+        )
+        self.assets = {}
+        self.loaders = {}
+        self.fonts = {}
+        self.lock = threading.Lock()
+        self.timeline = []
+
+    def elapsed_ms(self) -> float:
+        return (time.perf_counter() - self.start_time) * 1000
+
+    @contextmanager
+    def span(self, name: str):
+        start = self.elapsed_ms()
+        yield
+        self.record(name, start)
+
+    def record(self, name: str, start: float):
+        self.timeline.append(
+            (name, threading.current_thread().name, start, self.elapsed_ms())
+        )
+
+    def mark(self, name: str):
+        self.record(name, self.elapsed_ms())
+
+    @staticmethod
+    def key_name(key: tuple) -> str:
+        return " ".join(os.path.basename(str(part)) for part in key)
+
+    def timed_load(self, key: tuple, loader, *args):
+        with self.span(self.key_name(key)):
+            return loader(*args)
+
+    def load(self, key: tuple, loader, *args):
+        with self.lock:
+            if key in self.assets or key in self.loaders:
+                return
+            if self.executor is None:
+                self.loaders[key] = (loader, args)
+                return
+            self.assets[key] = self.executor.submit(self.timed_load, key, loader, *args)
+
+    def get(self, key: tuple):
+        with self.lock:
+            if key in self.loaders:
+                loader, args = self.loaders.pop(key)
+                future = self.assets[key] = Future()
+                future.set_result(self.timed_load(key, loader, *args))
+            asset = self.assets[key]
+        if asset.done():
+            return asset.result()
+        with self.span(f"wait {self.key_name(key)}"):
+            return asset.result()
+
+    def font(self, path: str, size: int) -> pygame.Font:
+        # fonts are needed for the first frame, so they load on the calling thread
+        key = ("font", path, size)
+        with self.lock:
+            if key not in self.fonts:
+                self.fonts[key] = self.timed_load(key, pygame.Font, path, size)
+            return self.fonts[key]
+
+    def load_sound(self, path: str):
+        self.load(("sound", path), pygame.mixer.Sound, path)
+
+    def sound(self, path: str) -> DeferredSound:
+        self.load_sound(path)
+        return DeferredSound(self, path)
+
+    def load_music(self, path: str):
+        self.load(("music", path), pygame.mixer.music.load, path)
+
+    def music(self, path: str):
+        self.load_music(path)
+        self.get(("music", path))
+
+    def report_rows(self) -> list[tuple[str, str, str, str]]:
+        rows = [("startup", "thread", "start ms", "end ms")]
+        for name, thread, start, end in sorted(self.timeline, key=lambda e: e[2]):
+            rows.append((name, thread, f"{start:.1f}", f"{end:.1f}"))
+        return rows
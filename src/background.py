@@ -0,0 +1,101 @@
+from typing import TYPE_CHECKING
+
+import zengl
+
+from src.shader_pipeline import ShaderPipeline
+
+if TYPE_CHECKING:
+    from src.app import App
+
+
+class BackgroundLayer:
+    def __init__(
+        self,
+        app: "App",
+        uniforms_buffer: zengl.Buffer,
+        mode: str = "direct",
+        scale: float = 1.0,
+        update_rate: float = 0,
+    ):
+        if mode not in ("direct", "cached"):
+            raise ValueError(f"Unknown background mode: {mode}")
+        self.app = app
+        self.mode = mode
+        self.scale = 1.0
+        self.size = self.app.screen_size
+        self.uv_scale = (1.0, 1.0)
+        self.update_rate = update_rate
+        self.last_update_time = None
+        self.image = None
+        if self.mode == "cached":
+            # the image stays at screen size, scaling only shrinks the viewport
+            self.image = self.app.resources.image(
+                self, self.app.screen_size, tag="background"
+            )
+        framebuffer = [self.image] if self.image else None
+        self.aurora_shader = ShaderPipeline(
+            app,
+            uniforms_buffer,
+            frag_shader_id="aurora",
+            has_tex=False,
+            framebuffer=framebuffer,
+        )
+        self.space_bg_shader = ShaderPipeline(
+            app,
+            uniforms_buffer,
+            frag_shader_id="space_bg",
+            has_tex=False,
+            framebuffer=framebuffer,
+        )
+        self.pipelines = [self.aurora_shader, self.space_bg_shader]
+        if self.image:
+            self.composite_shader = ShaderPipeline(
+                app,
+                uniforms_buffer,
+                frag_shader_id="upscale",
+                image_tag="background",
+                tex_filter="linear",
+                blend=None,
+            )
+            self.pipelines.append(self.composite_shader)
+            self.set_scale(scale)
+
+    def set_scale(self, scale: float):
+        self.scale = min(max(scale, 0.01), 1.0)
+        self.size = (
+            max(1, round(self.app.screen_w * self.scale)),
+            max(1, round(self.app.screen_h * self.scale)),
+        )
+        self.uv_scale = (
+            self.size[0] / self.app.screen_w,
+            self.size[1] / self.app.screen_h,
+        )
+        self.aurora_shader.set_viewport_size(self.size)
+        self.space_bg_shader.set_viewport_size(self.size)
+        self.last_update_time = None
+
+    def release(self):
+        for pipeline in self.pipelines:
+            pipeline.release()
+        self.app.resources.release(self)
+
+    def needs_update(self, elapsed_time: float) -> bool:
+        return (
+            self.last_update_time is None
+            or not self.update_rate
+            or elapsed_time - self.last_update_time >= 1 / self.update_rate
+            or elapsed_time < self.last_update_time
+        )
+
+    def render(self, elapsed_time: float):
+        if self.mode == "direct":
+            self.aurora_shader.render()
+            self.space_bg_shader.render()
+            return
+
+        if self.needs_update(elapsed_time):
+            self.last_update_time = elapsed_time
+            self.image.clear()
+            self.aurora_shader.render()
+            self.space_bg_shader.render()
+        self.composite_shader.render()
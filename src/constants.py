@@ -1,5 +1,40 @@
 SCREEN_SIZE = (800, 600)
 
+# fill the sky with this many background stars (e.g. 100_000) instead of the
+# level's count, 0 keeps the normal progression
+DENSE_SKY_STARS = 0
+
+# size star instance quads to each star's footprint instead of the whole screen
+STAR_SPRITES = True
+
+# hash the random background stars on the GPU from a per-level seed instead
+# of generating them on the CPU and uploading them as instance data
+PROCEDURAL_STARS = False
+
+# "direct" draws the aurora and space background passes every frame at full
+# resolution, "cached" draws them into an offscreen image at BACKGROUND_SCALE
+# of the screen size, at most BACKGROUND_FPS times a second, and upsamples it
+BACKGROUND_MODE = "cached"
+BACKGROUND_SCALE = 0.5
+BACKGROUND_FPS = 30
+
+# in cached mode, lower or raise the background scale (down to
+# BACKGROUND_MIN_SCALE) to keep frames under this many ms, 0 keeps it fixed
+FRAME_BUDGET_MS = 1000 / 60
+BACKGROUND_MIN_SCALE = 0.25
+
+# cap frames at FPS_CAP (0 uncaps) and let display.flip wait for the next
+# refresh with VSYNC, drop to IDLE_FPS while the fact or game complete screen
+# is waiting for input (0 disables)
+FPS_CAP = 60
+VSYNC = True
+IDLE_FPS = 10
+
+# run game logic at a fixed SIM_RATE ticks per second independent of the frame
+# rate and interpolate the reference shape between ticks, 0 updates once per
+# rendered frame
+SIM_RATE = 0
+
 BLACK = (0, 0, 0)
 WHITE = (255, 255, 255)
 RED = (255, 0, 0)
@@ -12,3 +47,5 @@ PURPLE = (115, 55, 115, 225)
 FONT_PATH = "assets/fonts/Poppins-Regular.ttf"
 CONST_COMPLETE_SOUND_PATH = "assets/sfx/constellation_complete.ogg"
 MUSIC_PATH = "assets/sfx/suno_ai_track.ogg"
+# daily level packs built by tools/build_level_pack.py
+LEVEL_PACK_DIR = "levels"
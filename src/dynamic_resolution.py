@@ -0,0 +1,37 @@
+from src.background import BackgroundLayer
+
+
+class DynamicResolution:
+    def __init__(
+        self,
+        background: BackgroundLayer,
+        budget_ms: float,
+        min_scale: float = 0.25,
+        max_scale: float = 1.0,
+        step: float = 0.05,
+        window: int = 30,
+        headroom: float = 0.8,
+    ):
+        self.background = background
+        self.budget_ms = budget_ms
+        self.min_scale = min_scale
+        self.max_scale = max_scale
+        self.step = step
+        self.window = window
+        self.headroom = headroom
+        self.samples = []
+
+    def update(self, frame_ms: float):
+        self.samples.append(frame_ms)
+        if len(self.samples) < self.window:
+            return
+        mean_ms = sum(self.samples) / len(self.samples)
+        self.samples = []
+        scale = self.background.scale
+        if mean_ms > self.budget_ms:
+            scale -= self.step
+        elif mean_ms < self.budget_ms * self.headroom:
+            scale += self.step
+        scale = round(min(max(scale, self.min_scale), self.max_scale), 2)
+        if scale != self.background.scale:
+            self.background.set_scale(scale)
@@ -0,0 +1,35 @@
+class FixedTimestep:
+    def __init__(self, rate: float, max_steps: int = 8):
+        self.step_ms = 1000 / rate
+        self.max_steps = max_steps
+        self.origin_ms = None
+        self.step_count = 0
+        self.frame_ms = 0
+
+    @property
+    def sim_ms(self) -> float:
+        return self.origin_ms + self.step_count * self.step_ms
+
+    def advance(self, ticks: int) -> int:
+        self.frame_ms = ticks
+        if self.origin_ms is None:
+            # run one step on the first frame so the game has a state to draw
+            self.origin_ms = ticks - self.step_ms
+            return 1
+        # the epsilon keeps float error from dropping a step that is due
+        due = int((ticks - self.origin_ms) / self.step_ms + 1e-6)
+        steps = due - self.step_count
+        if steps > self.max_steps:
+            # after a stall, skip the backlog in one jump instead of catching up
+            # step by step, the game clock still follows the ticks
+            self.step_count += steps - self.max_steps
+            steps = self.max_steps
+        return max(steps, 0)
+
+    def step(self) -> int:
+        self.step_count += 1
+        return round(self.sim_ms)
+
+    @property
+    def alpha(self) -> float:
+        return min(max((self.frame_ms - self.sim_ms) / self.step_ms, 0.0), 1.0)
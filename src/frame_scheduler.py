@@ -0,0 +1,66 @@
+import asyncio
+import time
+
+import pygame
+
+from src.input import INPUT_EVENTS
+
+
+class FrameScheduler:
+    def __init__(
+        self,
+        fps_cap: float = 60,
+        idle_fps: float = 10,
+        vsync: bool = False,
+        refresh_rate: float = 0,
+        idle_delay: float = 0.5,
+    ):
+        self.fps_cap = fps_cap
+        self.idle_fps = idle_fps
+        self.vsync = vsync
+        self.refresh_rate = refresh_rate
+        self.idle_delay = idle_delay
+        self.last_input_time = time.perf_counter()
+        self.last_present_time = None
+        self.interval_ms = 0.0
+        self.jitter_ms = 0.0
+
+    def notify_input(self, events: list[pygame.event.Event]):
+        if any(event.type in INPUT_EVENTS for event in events):
+            self.last_input_time = time.perf_counter()
+
+    def is_idle(self, waiting_for_input: bool) -> bool:
+        return (
+            waiting_for_input
+            and bool(self.idle_fps)
+            and time.perf_counter() - self.last_input_time >= self.idle_delay
+        )
+
+    def target_interval(self, idle: bool) -> float:
+        if idle:
+            return 1 / self.idle_fps
+        if not self.fps_cap:
+            return 0
+        # display.flip already blocks until the next refresh
+        if self.vsync and self.refresh_rate and self.fps_cap >= self.refresh_rate:
+            return 0
+        return 1 / self.fps_cap
+
+    async def wait(self, idle: bool):
+        target = self.target_interval(idle)
+        if target and self.last_present_time is not None:
+            deadline = self.last_present_time + target
+            while (remaining := deadline - time.perf_counter()) > 0:
+                if idle and pygame.event.peek(INPUT_EVENTS):
+                    break
+                # while idle, wake up regularly to check for input
+                await asyncio.sleep(min(remaining, 0.01) if idle else remaining)
+        else:
+            await asyncio.sleep(0)
+
+        now = time.perf_counter()
+        if self.last_present_time is not None:
+            interval_ms = (now - self.last_present_time) * 1000
+            self.jitter_ms = abs(interval_ms - self.interval_ms)
+            self.interval_ms = interval_ms
+        self.last_present_time = now
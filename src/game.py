@@ -1,11 +1,14 @@
 from typing import TYPE_CHECKING
+from concurrent.futures import Future, ThreadPoolExecutor
 import pygame
 
 import random
+import sys
 import time
 
 import src.constants as constants
 from src.gui import GUI
+from src.level import Level
 from src.stars import Stars
 from src.star_facts import STAR_FACTS
 
@@ -22,7 +25,7 @@ class Game:
         self.max_level = 42
         self.num_start_hints = 3
         self.max_constellation_points = 8
-        self.max_random_points = 100
+        self.max_random_points = max(100, constants.DENSE_SKY_STARS)
         self.start_constellation_max_radius = self.app.screen_w // 12
         self.star_min_radius = self.app.screen_w // 400
         self.star_max_radius = self.app.screen_w // 200
@@ -32,12 +35,33 @@ class Game:
         self.constellation_max_radius = self.start_constellation_max_radius
         self.num_const_points = self.start_const_points
         self.num_rand_points = self.start_rand_points
-        self.const_complete_sound = pygame.mixer.Sound(
+        self.const_complete_sound = self.app.load_sound(
             constants.CONST_COMPLETE_SOUND_PATH
         )
         self.music_started = False
+        self.seed = None
+        self.level_pack = None
+        self.levels_generated = 0
+        self.level_generation = 0
+        self.next_level = None
+        self.transition_ms = None
+        # pygbag has no threads, so the next level is generated in place there
+        self.executor = (
+            None
+            if self.app.headless or sys.platform == "emscripten"
+            else ThreadPoolExecutor(max_workers=1, thread_name_prefix="level")
+        )
+
+    def draw(self, screen: pygame.Surface) -> list[pygame.Rect]:
+        self.gui.update_hud()
+        dirty_rects = self.gui.update_dirty_rects()
+        for rect in dirty_rects:
+            screen.set_clip(rect)
+            self.draw_scene(screen)
+        screen.set_clip(None)
+        return dirty_rects
 
-    def draw(self, screen: pygame.Surface):
+    def draw_scene(self, screen: pygame.Surface):
         screen.fill((0, 0, 0, 0))
         self.gui.draw(screen)
         if not self.game_complete:
@@ -77,51 +101,121 @@ class Game:
         self.gui.show_hint_button.colour = constants.GREEN
         self.game_complete = False
         self.fact_display_duration = 0
-        self.start_time = pygame.time.get_ticks()
+        self.start_time = self.app.get_ticks()
         self.num_const_points = self.start_const_points
         self.num_rand_points = self.start_rand_points
         self.constellation_max_radius = self.start_constellation_max_radius
+        self.level_generation += 1
+        self.next_level = None
+
+    def level_key(self, num_const_points: int, num_rand_points: int) -> tuple:
+        return (
+            self.level_generation,
+            self.levels_generated,
+            self.constellations_completed,
+            num_const_points,
+            num_rand_points,
+            self.constellation_max_radius,
+        )
 
-    def init_stars(self):
-        self.stars = Stars(
+    def next_level_seed(self) -> float:
+        # seeded levels follow the campaign step, so a reset replays the same
+        # levels, as a level pack does
+        return (
+            time.time()
+            if self.seed is None
+            else self.seed * 1_000_003 + self.constellations_completed
+        )
+
+    def generate_level(self, key: tuple, seed: float, seen_facts: frozenset) -> Level:
+        _, _, level_index, num_const_points, num_rand_points, max_radius = key
+        num_rand_points = constants.DENSE_SKY_STARS or num_rand_points
+        packed_level = None
+        if self.level_pack and level_index < len(self.level_pack):
+            # a packed level is a lookup, the rng is only used for live levels
+            packed_level = self.level_pack.level(level_index)
+            seed = packed_level.seed
+            num_const_points = packed_level.num_constellation_points
+            num_rand_points = packed_level.num_random_points
+        rng = random.Random(seed)
+        stars = Stars(
             self.app,
+            rng,
             star_min_radius=self.star_min_radius,
             star_max_radius=self.star_max_radius,
-            constellation_max_radius=self.constellation_max_radius,
+            constellation_max_radius=max_radius,
             max_constellation_points=self.max_constellation_points,
-            num_constellation_points=self.num_const_points,
-            num_random_points=self.num_rand_points,
+            num_constellation_points=num_const_points,
+            num_random_points=num_rand_points,
             max_random_points=self.max_random_points,
+            packed_level=packed_level,
         )
+        if packed_level:
+            fact = packed_level.fact
+        else:
+            unseen_facts = [fact for fact in STAR_FACTS if fact not in seen_facts]
+            fact = (
+                rng.choice(unseen_facts)
+                if len(seen_facts) < len(unseen_facts)
+                else rng.choice(STAR_FACTS)
+            )
+        fact_surf = None if self.app.headless else self.gui.render_fact(fact)
+        return Level(key, seed, stars, fact, fact_surf)
+
+    def prepare_next_level(self):
+        if self.constellations_completed >= self.max_level:
+            return
+        key = self.level_key(*self.next_difficulty())
+        args = (key, self.next_level_seed(), frozenset(self.seen_facts))
+        if self.executor:
+            self.next_level = self.executor.submit(self.generate_level, *args)
+        else:
+            self.next_level = Future()
+            self.next_level.set_result(self.generate_level(*args))
 
     def init_level(self):
-        random.seed(time.time())
-        self.init_stars()
-        self.start_drag_x = 0
-        self.start_drag_y = 0
+        start = time.perf_counter()
+        key = self.level_key(self.num_const_points, self.num_rand_points)
+        level = self.next_level.result() if self.next_level else None
+        if level is None or level.key != key:
+            level = self.generate_level(
+                key, self.next_level_seed(), frozenset(self.seen_facts)
+            )
+        self.next_level = None
+        self.apply_level(level)
+        self.transition_ms = (time.perf_counter() - start) * 1000
+
+    def apply_level(self, level: Level):
+        self.level_seed = level.seed
+        self.levels_generated += 1
+        self.stars = level.stars
+        self.grab_offset = None
         self.is_dragging = False
         self.show_fact = False
         self.continue_pressed = False
         self.show_hint = False
         self.fact_start_time = None
-        unseen_facts = [fact for fact in STAR_FACTS if fact not in self.seen_facts]
-        self.fact = (
-            random.choice(unseen_facts)
-            if len(self.seen_facts) < len(unseen_facts)
-            else random.choice(STAR_FACTS)
-        )
+        self.fact = level.fact
         self.seen_facts.add(self.fact)
-        self.gui.draw_fact(self.fact)
+        if level.fact_surf is not None:
+            self.gui.fact_surf = level.fact_surf
         self.complete_sound_played = False
 
+    def grab_reference(self, pos: tuple[int, int]):
+        reference_rect = self.stars.reference_rect
+        if reference_rect.collidepoint(pos):
+            self.grab_offset = (pos[0] - reference_rect.x, pos[1] - reference_rect.y)
+        else:
+            self.grab_offset = None
+
     def handle_reference_drag(self):
-        mouse_pos = pygame.mouse.get_pos()
-        if self.stars.reference_rect.collidepoint(mouse_pos):
-            current_mouse_x, current_mouse_y = mouse_pos
-            delta_x = current_mouse_x - self.start_drag_x
-            delta_y = current_mouse_y - self.start_drag_y
-            self.stars.move_reference_pos(delta_x, delta_y)
-            self.start_drag_x, self.start_drag_y = mouse_pos
+        # the shape stays under the point it was grabbed by, even when a fast
+        # drag moves the mouse past its edge between frames
+        if self.grab_offset is None:
+            return
+        mouse_x, mouse_y = self.app.get_mouse_pos()
+        offset_x, offset_y = self.grab_offset
+        self.stars.set_reference_pos((mouse_x - offset_x, mouse_y - offset_y))
 
     def handle_hint_click(self):
         if (
@@ -137,7 +231,7 @@ class Game:
                 self.gui.show_hint_button.colour = constants.GREY
 
     def handle_fact_close(self):
-        self.fact_display_duration += pygame.time.get_ticks() - self.fact_start_time
+        self.fact_display_duration += self.app.get_ticks() - self.fact_start_time
 
     def handle_shape_match(self):
         if not self.complete_sound_played:
@@ -150,11 +244,12 @@ class Game:
         self.show_hint = False
 
         if self.fact_start_time is None:
-            self.fact_start_time = pygame.time.get_ticks()
+            self.fact_start_time = self.app.get_ticks()
+            self.prepare_next_level()
 
     def handle_timer(self):
         current_time = (
-            pygame.time.get_ticks() - self.start_time - self.fact_display_duration
+            self.app.get_ticks() - self.start_time - self.fact_display_duration
         ) / 1000
         self.current_time = current_time if not self.show_fact else self.current_time
 
@@ -164,10 +259,10 @@ class Game:
                 self.continue_pressed = True
 
             self.is_dragging = True
-            self.start_drag_x, self.start_drag_y = event.pos
+            self.grab_reference(event.pos)
 
             if not self.music_started:
-                pygame.mixer.music.play(-1)
+                self.app.play_music()
                 self.music_started = True
 
             if self.gui.show_hint_button.is_clicked(event.pos):
@@ -179,15 +274,31 @@ class Game:
 
         elif event.type == pygame.MOUSEBUTTONUP:
             self.is_dragging = False
+            self.grab_offset = None
 
     def increment_level(self):
         if self.constellations_completed >= self.max_level:
             self.game_complete = True
             return
 
-        if self.constellations_completed % 2 == 0:
-            self.num_const_points += self.const_points_increment
+        self.num_const_points, self.num_rand_points = self.next_difficulty()
+        self.init_level()
 
-        self.num_rand_points += self.rand_points_increment
+    def next_difficulty(self) -> tuple[int, int]:
+        return self.difficulty_after(
+            self.num_const_points, self.num_rand_points, self.constellations_completed
+        )
 
-        self.init_level()
+    def difficulty_after(
+        self, num_const_points: int, num_rand_points: int, completed: int
+    ) -> tuple[int, int]:
+        if completed % 2 == 0:
+            num_const_points += self.const_points_increment
+        return num_const_points, num_rand_points + self.rand_points_increment
+
+    def campaign_difficulties(self) -> list[tuple[int, int]]:
+        # every level of a campaign played without resets
+        difficulties = [(self.start_const_points, self.start_rand_points)]
+        for completed in range(1, self.max_level):
+            difficulties.append(self.difficulty_after(*difficulties[-1], completed))
+        return difficulties
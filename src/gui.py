@@ -6,6 +6,7 @@ if TYPE_CHECKING:
     from src.app import App
 
 import src.constants as constants
+from src.text import TextRenderer
 
 
 class Button:
@@ -18,6 +19,7 @@ class Button:
         height: int,
         colour: tuple[int, int, int],
         text_colour: tuple[int, int, int],
+        text_renderer: TextRenderer,
     ):
         self.app = app
         self.x = x
@@ -28,20 +30,23 @@ class Button:
         self.text_colour = text_colour
         self.rect = pygame.Rect(x, y, width, height)
         self.font_size = self.app.screen_w // 50
-        self.font = pygame.font.Font(constants.FONT_PATH, self.font_size)
+        self.text_renderer = text_renderer
         self.clicked = False
+        self.text = ""
 
-    def draw(self, screen: pygame.Surface, text: str):
-        pygame.draw.rect(screen, self.colour, self.rect)
-        text_surf = self.font.render(text, True, self.text_colour)
-        screen.blit(
-            text_surf,
-            (
-                self.rect.centerx - text_surf.get_width() // 2,
-                self.rect.centery - text_surf.get_height() // 2,
-            ),
+    def get_text_item(self) -> tuple[str, int, tuple, tuple[int, int], int]:
+        text_w, text_h = self.text_renderer.layout(self.text, self.font_size).size
+        return (
+            self.text,
+            self.font_size,
+            self.text_colour,
+            (self.rect.centerx - text_w // 2, self.rect.centery - text_h // 2),
+            0,
         )
 
+    def draw(self, screen: pygame.Surface):
+        pygame.draw.rect(screen, self.colour, self.rect)
+
     def is_clicked(self, mouse_pos: tuple[int, int]) -> bool:
         return self.rect.collidepoint(mouse_pos)
 
@@ -54,6 +59,8 @@ class GUI:
         self.init_font()
         self.init_buttons()
         self.init_game_complete()
+        self.init_dirty_rects()
+        self.init_hud()
 
     def init_bottom_panel(self):
         self.bottom_panel = pygame.Surface((self.app.screen_w, self.app.screen_h // 4))
@@ -71,15 +78,11 @@ class GUI:
         self.game_complete_rect = self.game_complete_surf.get_rect(
             center=(self.app.screen_w // 2, self.app.screen_h // 2)
         )
-        text_surf = self.font.render(
-            "Congratulations!",
-            True,
-            constants.BLACK,
+        text_surf = self.text.render(
+            "Congratulations!", self.font_size, constants.BLACK
         )
-        text_surf_2 = self.font.render(
-            f"You completed the game!",
-            True,
-            constants.BLACK,
+        text_surf_2 = self.text.render(
+            "You completed the game!", self.font_size, constants.BLACK
         )
         self.game_complete_surf.blit(
             text_surf,
@@ -107,6 +110,7 @@ class GUI:
             self.app.screen_h // 20,
             constants.GREEN,
             constants.BLACK,
+            self.text,
         )
         self.reset_button = Button(
             self.app,
@@ -116,7 +120,19 @@ class GUI:
             self.app.screen_h // 20,
             constants.BLACK,
             constants.WHITE,
+            self.text,
         )
+        self.reset_button.text = "Reset"
+
+    def init_dirty_rects(self):
+        self.screen_rect = pygame.Rect(0, 0, *self.app.screen_size)
+        self.dirty_rects = []
+        self.scene_state = None
+
+    def init_hud(self):
+        self.hud_items = None
+        self.hud_instance_data = None
+        self.hud_glyph_count = 0
 
     def init_fact_surf(self):
         self.fact_surf = pygame.Surface(
@@ -134,49 +150,94 @@ class GUI:
     def init_font(self):
         self.font_size = self.app.screen_w // 40
         pygame.font.init()
-        self.font = pygame.Font(constants.FONT_PATH, self.font_size)
+        # glyph sizes scale with the screen width, so the atlas has to as well
+        atlas_w = max(512, self.app.screen_w * 512 // 800)
+        self.text = TextRenderer(
+            constants.FONT_PATH, self.app.assets, atlas_size=(atlas_w, atlas_w)
+        )
+        if self.app.headless:
+            return
+        for font_size in (self.font_size, self.app.screen_w // 50):
+            self.text.preload(font_size)
 
     def draw_game_complete(self, screen: pygame.Surface):
         screen.blit(self.game_complete_surf, self.game_complete_rect)
 
     def draw(self, screen: pygame.Surface):
         screen.blit(self.bottom_panel, self.bottom_panel_rect)
-        text = self.font.render(
-            (
-                f"Level: {self.app.game.constellations_completed}/{self.app.game.max_level}"
-                f"\n\nCurrent Time: {self.app.game.current_time:.0f} seconds"
-                # f"\nFPS: {self.app.clock.get_fps():.0f}"
-            ),
-            True,
-            constants.WHITE,
+        self.show_hint_button.draw(screen)
+        self.reset_button.draw(screen)
+
+    def mark_dirty(self, rect: pygame.Rect):
+        rect = rect.clip(self.screen_rect)
+        if rect.w and rect.h:
+            self.dirty_rects.append(rect)
+
+    def update_hud(self):
+        game = self.app.game
+        status_text = (
+            f"Level: {game.constellations_completed}/{game.max_level}"
+            f"\n\nCurrent Time: {game.current_time:.0f} seconds"
+            # f"\nFPS: {self.app.clock.get_fps():.0f}"
         )
-        screen.blit(
-            text,
+        status_h = self.text.layout(status_text, self.font_size).size[1]
+        self.show_hint_button.text = f"Show Hint ({game.hints_remaining})"
+        hud_items = [
             (
-                self.app.screen_w // 100,
-                self.bottom_panel_rect.centery - text.get_height() // 2,
+                status_text,
+                self.font_size,
+                constants.WHITE,
+                (
+                    self.app.screen_w // 100,
+                    self.bottom_panel_rect.centery - status_h // 2,
+                ),
+                0,
             ),
+            self.show_hint_button.get_text_item(),
+            self.reset_button.get_text_item(),
+        ]
+        if hud_items != self.hud_items:
+            self.hud_items = hud_items
+            self.hud_instance_data = self.text.instance_data(hud_items)
+            self.hud_glyph_count = len(self.hud_instance_data) // 12
+
+    def update_dirty_rects(self) -> list[pygame.Rect]:
+        game = self.app.game
+        scene_state = (
+            game.stars,
+            game.fact,
+            game.show_fact,
+            game.show_hint,
+            game.game_complete,
+            game.constellations_completed,
+            self.show_hint_button.colour,
         )
-        self.show_hint_button.draw(
-            screen, f"Show Hint ({self.app.game.hints_remaining})"
-        )
-        self.reset_button.draw(screen, "Reset")
+        if scene_state != self.scene_state:
+            self.scene_state = scene_state
+            self.mark_dirty(self.screen_rect)
+
+        if self.screen_rect in self.dirty_rects:
+            self.dirty_rects = [self.screen_rect]
+        dirty_rects, self.dirty_rects = self.dirty_rects, []
+        return dirty_rects
 
-    def draw_fact(self, fact: str):
-        text = self.font.render(
+    def render_fact(self, fact: str) -> pygame.Surface:
+        text = self.text.render(
             fact + "\n\nClick to continue...",
-            True,
+            self.font_size,
             constants.WHITE,
             wraplength=self.app.screen_w - self.app.screen_w // 10,
         )
-        self.fact_surf.fill(self.fact_colour)
-        self.fact_surf.blit(
+        fact_surf = pygame.Surface(self.fact_rect.size, pygame.SRCALPHA)
+        fact_surf.fill(self.fact_colour)
+        fact_surf.blit(
             text,
             (
                 self.fact_rect.centerx - text.get_width() // 2,
                 self.fact_rect.centery - text.get_height(),
             ),
         )
+        return fact_surf
 
     def draw_arrow_surf(self, surf: pygame.Surface, center_x: int, center_y: int):
         size = self.app.screen_w // 40
@@ -198,9 +259,9 @@ class GUI:
         )
 
     def draw_instructions(self, screen: pygame.Surface):
-        text = self.font.render(
+        text = self.text.render(
             "Click and drag the reference shape to match the constellation!",
-            True,
+            self.font_size,
             constants.LIGHT_GREEN,
         )
         pygame.draw.rect(
@@ -0,0 +1,149 @@
+import argparse
+import os
+import random
+import time
+from typing import Iterable, Iterator
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import pygame
+
+import src.constants as constants
+from src.assets import AssetManager
+from src.game import Game
+
+
+class SilentSound:
+    def play(self):
+        pass
+
+
+class HeadlessApp:
+    headless = True
+
+    def __init__(
+        self,
+        seed: int = 0,
+        screen_size: tuple[int, int] = constants.SCREEN_SIZE,
+        frame_ms: int = 16,
+    ):
+        self.screen_size = self.screen_w, self.screen_h = screen_size
+        self.frame_ms = frame_ms
+        self.ticks = 0
+        self.mouse_pos = (0, 0)
+        self.frames = 0
+        self.assets = AssetManager(threaded=False)
+        self.game = Game(self)
+        self.new_game(seed)
+
+    def new_game(self, seed: int):
+        # the app, GUI and fonts are kept between games, only the game restarts
+        self.ticks = 0
+        self.frames = 0
+        self.game.seed = seed
+        self.game.levels_generated = 0
+        self.game.reset_level()
+        self.game.init_level()
+
+    def get_ticks(self) -> int:
+        return self.ticks
+
+    def get_mouse_pos(self) -> tuple[int, int]:
+        return self.mouse_pos
+
+    def load_sound(self, path: str) -> SilentSound:
+        return SilentSound()
+
+    def play_music(self):
+        pass
+
+    def step(self, events: Iterable[pygame.event.Event] = ()):
+        self.ticks += self.frame_ms
+        for event in events:
+            if hasattr(event, "pos"):
+                self.mouse_pos = event.pos
+            self.game.handle_events(event)
+        self.game.update()
+        self.frames += 1
+
+    def run_script(self, frames: Iterable[list[pygame.event.Event]]):
+        for events in frames:
+            self.step(events)
+
+
+class AutoPlayer:
+    def __init__(self, seed: int = 0, hint_chance: float = 0.1):
+        self.rng = random.Random(seed)
+        self.hint_chance = hint_chance
+
+    def level_frames(self, game: Game) -> Iterator[list[pygame.event.Event]]:
+        if self.rng.random() < self.hint_chance:
+            pos = game.gui.show_hint_button.rect.center
+            yield [mouse_event(pygame.MOUSEBUTTONDOWN, pos)]
+            yield [mouse_event(pygame.MOUSEBUTTONUP, pos)]
+
+        stars = game.stars
+        x, y = stars.reference_rect.center
+        target_x, target_y = stars.constellation_rect.center
+        max_step = max(1, min(stars.reference_rect.size) // 2 - 1)
+        num_steps = max(abs(target_x - x), abs(target_y - y)) // max_step + 1
+        yield [mouse_event(pygame.MOUSEBUTTONDOWN, (x, y))]
+        for step in range(1, num_steps + 1):
+            pos = (
+                x + (target_x - x) * step // num_steps,
+                y + (target_y - y) * step // num_steps,
+            )
+            yield [mouse_event(pygame.MOUSEMOTION, pos)]
+        yield [mouse_event(pygame.MOUSEBUTTONUP, (target_x, target_y))]
+
+        pos = (self.rng.randrange(game.app.screen_w), 0)
+        yield [mouse_event(pygame.MOUSEBUTTONDOWN, pos)]
+        yield [mouse_event(pygame.MOUSEBUTTONUP, pos)]
+
+    def game_frames(self, game: Game) -> Iterator[list[pygame.event.Event]]:
+        while not game.game_complete:
+            yield from self.level_frames(game)
+
+
+def mouse_event(event_type: int, pos: tuple[int, int]) -> pygame.event.Event:
+    if event_type == pygame.MOUSEMOTION:
+        return pygame.event.Event(event_type, pos=pos, rel=(0, 0), buttons=(1, 0, 0))
+    return pygame.event.Event(event_type, pos=pos, button=1)
+
+
+def simulate_game(app: HeadlessApp, seed: int):
+    app.new_game(seed)
+    app.run_script(AutoPlayer(seed).game_frames(app.game))
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Play scripted games without a display, GL context or audio"
+    )
+    parser.add_argument("--games", type=int, default=100)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    levels = 0
+    frames = 0
+    checksum = 0
+    start = time.perf_counter()
+    app = HeadlessApp(seed=args.seed)
+    for game_index in range(args.games):
+        simulate_game(app, args.seed + game_index)
+        levels += app.game.levels_generated
+        frames += app.frames
+        checksum = hash(
+            (checksum, app.frames, app.game.stars.constellation_rect.topleft)
+        )
+    elapsed = time.perf_counter() - start
+
+    print(f"games:  {args.games} ({args.games / elapsed:.1f}/s)")
+    print(f"levels: {levels} ({levels / elapsed:.1f}/s)")
+    print(f"frames: {frames} ({frames / elapsed:.1f}/s)")
+    print(f"checksum: {checksum & 0xFFFFFFFF:08x}")
+
+
+if __name__ == "__main__":
+    main()
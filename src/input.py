@@ -0,0 +1,68 @@
+import time
+
+import pygame
+
+INPUT_EVENTS = (
+    pygame.QUIT,
+    pygame.KEYDOWN,
+    pygame.MOUSEBUTTONDOWN,
+    pygame.MOUSEBUTTONUP,
+    pygame.MOUSEMOTION,
+)
+
+
+class InputHandler:
+    def __init__(self):
+        self.input_time = None
+        self.coalesced_count = 0
+        self.latencies = []
+
+    @staticmethod
+    def allow_input_events():
+        # SDL drops every other event type before it reaches the queue
+        pygame.event.set_blocked(None)
+        pygame.event.set_allowed(INPUT_EVENTS)
+
+    def poll(self) -> list[pygame.event.Event]:
+        self.coalesced_count = 0
+        return self.coalesce(pygame.event.get())
+
+    def coalesce(self, events: list[pygame.event.Event]) -> list[pygame.event.Event]:
+        # the game only needs where the mouse ended up, so a frame's motion
+        # events become one event with the latest position and the summed delta
+        coalesced = []
+        motion = None
+        rel_x = rel_y = 0
+        for event in events:
+            if event.type != pygame.MOUSEMOTION:
+                coalesced.append(event)
+                continue
+            motion = event
+            rel_x += event.rel[0]
+            rel_y += event.rel[1]
+            self.coalesced_count += 1
+        if motion is not None:
+            self.coalesced_count -= 1
+            coalesced.append(
+                pygame.event.Event(
+                    pygame.MOUSEMOTION,
+                    pos=motion.pos,
+                    rel=(rel_x, rel_y),
+                    buttons=motion.buttons,
+                )
+            )
+        return coalesced
+
+    def received(self, events: list[pygame.event.Event]):
+        # pygame does not expose SDL's event timestamps, so the clock starts
+        # when the frame picks the input up
+        if events and self.input_time is None:
+            self.input_time = time.perf_counter()
+
+    def presented(self) -> float | None:
+        if self.input_time is None:
+            return None
+        latency_ms = (time.perf_counter() - self.input_time) * 1000
+        self.input_time = None
+        self.latencies.append(latency_ms)
+        return latency_ms
@@ -0,0 +1,19 @@
+import pygame
+
+from src.stars import Stars
+
+
+class Level:
+    def __init__(
+        self,
+        key: tuple,
+        seed: float,
+        stars: Stars,
+        fact: str,
+        fact_surf: pygame.Surface | None,
+    ):
+        self.key = key
+        self.seed = seed
+        self.stars = stars
+        self.fact = fact
+        self.fact_surf = fact_surf
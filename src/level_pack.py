@@ -0,0 +1,159 @@
+from array import array
+import datetime
+import mmap
+import os
+import struct
+import sys
+
+import src.constants as constants
+from src.level import Level
+from src.star_facts import STAR_FACTS
+from src.starfield import FLOATS_PER_STAR
+from src.stars import FLOATS_PER_REFERENCE_SEGMENT
+
+MAGIC = b"CLVL"
+VERSION = 1
+# magic, version, procedural stars, campaign seed, dense sky stars, screen
+# size and level count, followed by one LEVEL record per level and then the
+# float32 data the records point into
+HEADER = struct.Struct("<4sHHqIHHI")
+# level seed, star seed, star count, random star count, constellation point
+# count, fact index, shape center, constellation rect and float data offset
+LEVEL = struct.Struct("<qIIIHH2h4iI")
+FLOAT_SIZE = 4
+
+
+def daily_seed(date: datetime.date) -> int:
+    return int(date.strftime("%Y%m%d"))
+
+
+def daily_pack_path(date: datetime.date) -> str:
+    return os.path.join(constants.LEVEL_PACK_DIR, f"daily-{date.isoformat()}.lvl")
+
+
+def write_level_pack(
+    path: str,
+    seed: int,
+    screen_size: tuple[int, int],
+    dense_sky_stars: int,
+    procedural_stars: bool,
+    levels: list[Level],
+):
+    table = bytearray()
+    floats = array("f")
+    data_start = HEADER.size + len(levels) * LEVEL.size
+    for level in levels:
+        stars = level.stars
+        table += LEVEL.pack(
+            level.seed,
+            stars.star_seed,
+            stars.num_stars,
+            stars.num_random_points,
+            stars.num_constellation_points,
+            STAR_FACTS.index(level.fact),
+            *stars.shape_center,
+            *stars.constellation_rect,
+            data_start + len(floats) * FLOAT_SIZE,
+        )
+        floats.extend(value for point in stars.reference_points for value in point)
+        floats += stars.reference_instance_data
+        floats += stars.instance_data
+    with open(path, "wb") as f:
+        f.write(
+            HEADER.pack(
+                MAGIC,
+                VERSION,
+                procedural_stars,
+                seed,
+                dense_sky_stars,
+                *screen_size,
+                len(levels),
+            )
+        )
+        f.write(table)
+        f.write(floats.tobytes())
+
+
+class PackedLevel:
+    def __init__(self, pack: "LevelPack", index: int):
+        (
+            self.seed,
+            self.star_seed,
+            self.num_stars,
+            self.num_random_points,
+            self.num_constellation_points,
+            self.fact_index,
+            shape_x,
+            shape_y,
+            x,
+            y,
+            w,
+            h,
+            offset,
+        ) = LEVEL.unpack_from(pack.data, HEADER.size + index * LEVEL.size)
+        self.shape_center = (shape_x, shape_y)
+        self.constellation_rect = (x, y, w, h)
+        n = self.num_constellation_points
+        points = pack.floats(offset, 2 * n)
+        self.reference_points = list(zip(map(int, points[::2]), map(int, points[1::2])))
+        offset += 2 * n * FLOAT_SIZE
+        # the star arrays are views into the mapped file, not copies
+        self.reference_instance_data = pack.floats(
+            offset, 2 * n * FLOATS_PER_REFERENCE_SEGMENT
+        )
+        offset += 2 * n * FLOATS_PER_REFERENCE_SEGMENT * FLOAT_SIZE
+        self.instance_data = pack.floats(offset, self.num_stars * FLOATS_PER_STAR)
+
+    @property
+    def fact(self) -> str:
+        return STAR_FACTS[self.fact_index]
+
+
+class LevelPack:
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, "rb") as f:
+            # pygbag cannot map files, so the pack is read into memory there
+            if sys.platform == "emscripten":
+                self.data = f.read()
+            else:
+                self.data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        (
+            magic,
+            version,
+            procedural_stars,
+            self.seed,
+            self.dense_sky_stars,
+            screen_w,
+            screen_h,
+            self.num_levels,
+        ) = HEADER.unpack_from(self.data)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path} is not a version {VERSION} level pack")
+        self.procedural_stars = bool(procedural_stars)
+        self.screen_size = (screen_w, screen_h)
+        self.view = memoryview(self.data)
+
+    def __len__(self) -> int:
+        return self.num_levels
+
+    def check(
+        self, screen_size: tuple[int, int], dense_sky_stars: int, procedural_stars: bool
+    ):
+        # level geometry is in pixels and the star data depends on the sky mode
+        if (self.screen_size, self.dense_sky_stars, self.procedural_stars) != (
+            tuple(screen_size),
+            dense_sky_stars,
+            procedural_stars,
+        ):
+            raise ValueError(
+                f"{self.path} was built for {self.screen_size[0]}x{self.screen_size[1]}"
+                f" with DENSE_SKY_STARS={self.dense_sky_stars}"
+                f" and PROCEDURAL_STARS={self.procedural_stars}"
+            )
+
+    def floats(self, offset: int, count: int) -> memoryview:
+        return self.view[offset : offset + count * FLOAT_SIZE].cast("f")
+
+    def level(self, index: int) -> PackedLevel:
+        return PackedLevel(self, index)
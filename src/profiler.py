@@ -0,0 +1,215 @@
+from collections import deque
+from contextlib import contextmanager
+import csv
+import ctypes
+import json
+import sys
+import time
+
+import zengl
+
+GL_TIME_ELAPSED = 0x88BF
+GL_QUERY_RESULT = 0x8866
+GL_QUERY_RESULT_AVAILABLE = 0x8867
+
+
+class GpuTimer:
+    def __init__(self, loader):
+        def gl_function(name: str, *argtypes):
+            address = loader.load_opengl_function(name)
+            if not address:
+                raise RuntimeError(f"{name} is not available")
+            return ctypes.CFUNCTYPE(None, *argtypes)(address)
+
+        self.gen_queries = gl_function(
+            "glGenQueries", ctypes.c_int, ctypes.POINTER(ctypes.c_uint)
+        )
+        self.begin_query = gl_function("glBeginQuery", ctypes.c_uint, ctypes.c_uint)
+        self.end_query = gl_function("glEndQuery", ctypes.c_uint)
+        self.get_query_uiv = gl_function(
+            "glGetQueryObjectuiv",
+            ctypes.c_uint,
+            ctypes.c_uint,
+            ctypes.POINTER(ctypes.c_uint),
+        )
+        self.get_query_ui64v = gl_function(
+            "glGetQueryObjectui64v",
+            ctypes.c_uint,
+            ctypes.c_uint,
+            ctypes.POINTER(ctypes.c_uint64),
+        )
+        self.free_queries = []
+        self.pending = deque()
+
+    @classmethod
+    def create(cls) -> "GpuTimer | None":
+        if sys.platform.startswith("emscripten"):
+            return None
+        try:
+            return cls(zengl.loader())
+        except Exception:
+            return None
+
+    def begin(self, frame: int, name: str):
+        if self.free_queries:
+            query = self.free_queries.pop()
+        else:
+            query_id = ctypes.c_uint()
+            self.gen_queries(1, ctypes.byref(query_id))
+            query = query_id.value
+        self.begin_query(GL_TIME_ELAPSED, query)
+        self.pending.append((frame, name, query))
+
+    def end(self):
+        self.end_query(GL_TIME_ELAPSED)
+
+    def collect(self) -> list[tuple[int, str, float]]:
+        results = []
+        available = ctypes.c_uint()
+        elapsed = ctypes.c_uint64()
+        while self.pending:
+            frame, name, query = self.pending[0]
+            self.get_query_uiv(
+                query, GL_QUERY_RESULT_AVAILABLE, ctypes.byref(available)
+            )
+            if not available.value:
+                break
+            self.get_query_ui64v(query, GL_QUERY_RESULT, ctypes.byref(elapsed))
+            results.append((frame, name, elapsed.value / 1e6))
+            self.free_queries.append(query)
+            self.pending.popleft()
+        return results
+
+
+class FrameProfiler:
+    def __init__(self, window: int = 300, dump_path: str | None = None):
+        self.window = window
+        self.dump_path = dump_path
+        self.visible = False
+        self.frame = 0
+        self.cpu_times = {}
+        self.gpu_times = {}
+        self.counters = {}
+        self.frame_cpu_times = {}
+        self.frame_counters = {}
+        self.rows = {}
+        self.gpu_timer = None
+        self.keep_gpu_timing = False
+        self.gpu_frame_totals = {}
+        self.last_gpu_frame_ms = None
+        self.overlay_interval = 0.25
+        self.overlay_update_time = 0
+        self.overlay_rows = []
+
+    def init_gpu_timer(self):
+        self.gpu_timer = GpuTimer.create()
+
+    @property
+    def gpu_timing(self) -> bool:
+        return self.gpu_timer is not None and (
+            self.visible or bool(self.dump_path) or self.keep_gpu_timing
+        )
+
+    def toggle(self):
+        self.visible = not self.visible
+
+    @contextmanager
+    def stage(self, name: str):
+        start = time.perf_counter()
+        yield
+        elapsed = (time.perf_counter() - start) * 1000
+        self.frame_cpu_times[name] = self.frame_cpu_times.get(name, 0) + elapsed
+
+    @contextmanager
+    def gpu_stage(self, name: str):
+        if not self.gpu_timing:
+            with self.stage(name):
+                yield
+            return
+        self.gpu_timer.begin(self.frame, name)
+        with self.stage(name):
+            yield
+        self.gpu_timer.end()
+
+    def record_time(self, name: str, value: float):
+        self.frame_cpu_times[name] = self.frame_cpu_times.get(name, 0) + value
+
+    def frame_stage_ms(self, name: str) -> float:
+        return self.frame_cpu_times.get(name, 0)
+
+    def count(self, name: str, value: int):
+        self.frame_counters[name] = self.frame_counters.get(name, 0) + value
+
+    def record(self, samples: dict, name: str, value: float):
+        if name not in samples:
+            samples[name] = deque(maxlen=self.window)
+        samples[name].append(value)
+
+    def end_frame(self):
+        for name, value in self.frame_cpu_times.items():
+            self.record(self.cpu_times, name, value)
+        for name, value in self.frame_counters.items():
+            self.record(self.counters, name, value)
+        if self.dump_path:
+            self.rows[self.frame] = {
+                "frame": self.frame,
+                **{
+                    f"cpu:{name}": value for name, value in self.frame_cpu_times.items()
+                },
+                **self.frame_counters,
+            }
+        if self.gpu_timer is not None:
+            for frame, name, value in self.gpu_timer.collect():
+                self.record(self.gpu_times, name, value)
+                if frame in self.rows:
+                    self.rows[frame][f"gpu:{name}"] = value
+                self.gpu_frame_totals[frame] = (
+                    self.gpu_frame_totals.get(frame, 0) + value
+                )
+            pending = self.gpu_timer.pending
+            complete_before = pending[0][0] if pending else self.frame + 1
+            for frame in sorted(self.gpu_frame_totals):
+                if frame >= complete_before:
+                    break
+                self.last_gpu_frame_ms = self.gpu_frame_totals.pop(frame)
+        self.frame_cpu_times = {}
+        self.frame_counters = {}
+        self.frame += 1
+        now = time.perf_counter()
+        if self.visible and now - self.overlay_update_time >= self.overlay_interval:
+            self.overlay_update_time = now
+            self.overlay_rows = self.report_rows()
+
+    @staticmethod
+    def percentiles(samples: deque) -> tuple[float, float, float]:
+        ordered = sorted(samples)
+        last = len(ordered) - 1
+        return tuple(ordered[round(last * q)] for q in (0.5, 0.95, 0.99))
+
+    def report_rows(self) -> list[tuple[str, str, str]]:
+        rows = [("stage", "cpu p50/p95/p99 ms", "gpu p50/p95/p99 ms")]
+        for name, samples in self.cpu_times.items():
+            cpu = "/".join(f"{value:.2f}" for value in self.percentiles(samples))
+            gpu = ""
+            if name in self.gpu_times:
+                gpu = "/".join(
+                    f"{value:.2f}" for value in self.percentiles(self.gpu_times[name])
+                )
+            rows.append((name, cpu, gpu))
+        for name, samples in self.counters.items():
+            rows.append((name, str(samples[-1]), ""))
+        return rows
+
+    def dump(self):
+        if not self.dump_path:
+            return
+        rows = list(self.rows.values())
+        if self.dump_path.endswith(".json"):
+            with open(self.dump_path, "w") as f:
+                json.dump(rows, f)
+            return
+        fieldnames = list(dict.fromkeys(key for row in rows for key in row))
+        with open(self.dump_path, "w", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=fieldnames)
+            writer.writeheader()
+            writer.writerows(rows)
@@ -0,0 +1,89 @@
+import struct
+from typing import BinaryIO
+
+import pygame
+
+MAGIC = b"CSTR"
+VERSION = 1
+HEADER = struct.Struct("<4sHqI")
+FRAME = struct.Struct("<BIhh")
+EVENT = struct.Struct("<BBhhi")
+FRAME_RECORD = 0
+EVENT_RECORD = 1
+
+EVENT_CODES = {
+    pygame.QUIT: 0,
+    pygame.KEYDOWN: 1,
+    pygame.MOUSEBUTTONDOWN: 2,
+    pygame.MOUSEBUTTONUP: 3,
+}
+EVENT_TYPES = {code: event_type for event_type, code in EVENT_CODES.items()}
+
+
+class ReplayFrame:
+    def __init__(
+        self, ticks: int, mouse_pos: tuple[int, int], events: list[pygame.event.Event]
+    ):
+        self.ticks = ticks
+        self.mouse_pos = mouse_pos
+        self.events = events
+
+
+class InputRecorder:
+    def __init__(self, path: str, seed: int, start_ticks: int):
+        self.file: BinaryIO = open(path, "wb")
+        self.file.write(HEADER.pack(MAGIC, VERSION, seed, start_ticks))
+
+    def record_frame(
+        self, ticks: int, mouse_pos: tuple[int, int], events: list[pygame.event.Event]
+    ):
+        self.file.write(FRAME.pack(FRAME_RECORD, ticks, *mouse_pos))
+        for event in events:
+            code = EVENT_CODES.get(event.type)
+            if code is None:
+                continue
+            x, y = getattr(event, "pos", (0, 0))
+            value = getattr(event, "button", getattr(event, "key", 0))
+            self.file.write(EVENT.pack(EVENT_RECORD, code, x, y, value))
+
+    def close(self):
+        self.file.close()
+
+
+class InputReplayer:
+    def __init__(self, path: str):
+        with open(path, "rb") as f:
+            data = f.read()
+        magic, version, self.seed, self.start_ticks = HEADER.unpack_from(data)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path} is not a version {VERSION} input recording")
+        self.frames = self.parse_frames(data, HEADER.size)
+        self.frame_index = 0
+
+    @staticmethod
+    def parse_frames(data: bytes, offset: int) -> list[ReplayFrame]:
+        frames = []
+        while offset < len(data):
+            if data[offset] == FRAME_RECORD:
+                _, ticks, x, y = FRAME.unpack_from(data, offset)
+                frames.append(ReplayFrame(ticks, (x, y), []))
+                offset += FRAME.size
+                continue
+            _, code, x, y, value = EVENT.unpack_from(data, offset)
+            event_type = EVENT_TYPES[code]
+            if event_type == pygame.KEYDOWN:
+                event = pygame.event.Event(event_type, key=value, mod=0)
+            elif event_type == pygame.QUIT:
+                event = pygame.event.Event(event_type)
+            else:
+                event = pygame.event.Event(event_type, pos=(x, y), button=value)
+            frames[-1].events.append(event)
+            offset += EVENT.size
+        return frames
+
+    def next_frame(self) -> ReplayFrame | None:
+        if self.frame_index >= len(self.frames):
+            return None
+        frame = self.frames[self.frame_index]
+        self.frame_index += 1
+        return frame
@@ -0,0 +1,81 @@
+import zengl
+
+FORMAT_BYTES = {
+    "r8unorm": 1,
+    "rg8unorm": 2,
+    "rgba8unorm": 4,
+    "rgba16float": 8,
+    "rgba32float": 16,
+}
+
+
+class ResourcePool:
+    def __init__(self, ctx: zengl.Context):
+        self.ctx = ctx
+        self.images = {}
+        self.buffers = {}
+        self.owners = {}
+
+    @staticmethod
+    def image_bytes(size: tuple[int, int], image_format: str) -> int:
+        return size[0] * size[1] * FORMAT_BYTES[image_format]
+
+    def image(
+        self,
+        owner: object,
+        size: tuple[int, int],
+        image_format: str = "rgba8unorm",
+        tag: str | None = None,
+    ) -> zengl.Image:
+        key = (tuple(size), image_format, tag)
+        if key not in self.images:
+            self.images[key] = self.ctx.image(size, image_format)
+        self.owners.setdefault(owner, set()).add(key)
+        return self.images[key]
+
+    def buffer(self, owner: object, size: int) -> zengl.Buffer:
+        buffer = self.ctx.buffer(size=size)
+        self.buffers[buffer] = (owner, size)
+        return buffer
+
+    def release_buffer(self, buffer: zengl.Buffer):
+        del self.buffers[buffer]
+        self.ctx.release(buffer)
+
+    def is_shared(self, key: tuple) -> bool:
+        return sum(key in keys for keys in self.owners.values()) > 1
+
+    def release(self, owner: object):
+        keys = self.owners.pop(owner, set())
+        for key in keys:
+            if any(key in owner_keys for owner_keys in self.owners.values()):
+                continue
+            self.ctx.release(self.images.pop(key))
+        for buffer, (buffer_owner, _) in list(self.buffers.items()):
+            if buffer_owner is owner:
+                self.release_buffer(buffer)
+
+    def owner_bytes(self, owner: object) -> tuple[int, int]:
+        owned = shared = 0
+        for key in self.owners.get(owner, ()):
+            size = self.image_bytes(*key[:2])
+            if self.is_shared(key):
+                shared += size
+            else:
+                owned += size
+        owned += sum(size for o, size in self.buffers.values() if o is owner)
+        return owned, shared
+
+    @property
+    def total_bytes(self) -> int:
+        return sum(self.image_bytes(*key[:2]) for key in self.images) + sum(
+            size for _, size in self.buffers.values()
+        )
+
+    def report_rows(self, named_owners: dict) -> list[tuple[str, str, str]]:
+        rows = [("owner", "own KiB", "shared KiB")]
+        for name, owner in named_owners.items():
+            owned, shared = self.owner_bytes(owner)
+            rows.append((name, f"{owned / 1024:.0f}", f"{shared / 1024:.0f}"))
+        rows.append(("total", f"{self.total_bytes / 1024:.0f}", ""))
+        return rows
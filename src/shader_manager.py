@@ -0,0 +1,100 @@
+import hashlib
+import os
+import re
+import time
+
+import zengl
+
+SHADER_DIR = "src/shaders"
+INCLUDE = re.compile(r'#include\s+[<"]([^">]*)[">]')
+
+
+class ShaderManager:
+    def __init__(self, ctx: zengl.Context, shader_dir: str = SHADER_DIR):
+        self.ctx = ctx
+        self.shader_dir = shader_dir
+        self.sources = {}
+        self.mtimes = {}
+        self.preprocessed = {}
+        self.compile_ms = {}
+        self.load_sources()
+
+    def load_sources(self):
+        for file_name in sorted(os.listdir(self.shader_dir)):
+            if file_name.endswith((".vert", ".frag")):
+                self.load_source(file_name)
+
+    def load_source(self, file_name: str):
+        path = os.path.join(self.shader_dir, file_name)
+        self.mtimes[file_name] = os.stat(path).st_mtime_ns
+        with open(path) as f:
+            self.sources[file_name] = f.read()
+
+    def poll(self) -> set[str]:
+        changed = set()
+        for file_name, mtime in self.mtimes.items():
+            try:
+                if (
+                    os.stat(os.path.join(self.shader_dir, file_name)).st_mtime_ns
+                    == mtime
+                ):
+                    continue
+                self.load_source(file_name)
+            except OSError:
+                # the editor may be replacing the file, try again on the next poll
+                continue
+            changed.add(file_name)
+        return changed
+
+    def include_values(
+        self, shader_names: tuple[str, ...], includes: dict[str, str] | None = None
+    ) -> dict[str, str | None]:
+        includes = {**self.ctx.includes, **includes} if includes else self.ctx.includes
+        return {
+            name: includes.get(name)
+            for shader_name in shader_names
+            for name in INCLUDE.findall(self.sources[shader_name])
+        }
+
+    def source(self, shader_name: str, includes: dict[str, str] | None = None) -> str:
+        includes = {**self.ctx.includes, **includes} if includes else self.ctx.includes
+        source = self.sources[shader_name]
+        key = hashlib.sha1(source.encode())
+        for name in INCLUDE.findall(source):
+            if name not in includes:
+                raise KeyError(f'{shader_name}: cannot include "{name}"')
+            key.update(f"\0{name}\0{includes[name]}".encode())
+        key = key.hexdigest()
+        if key not in self.preprocessed:
+            self.preprocessed[key] = INCLUDE.sub(
+                lambda match: includes[match.group(1)], source
+            )
+        return self.preprocessed[key]
+
+    def pipeline(
+        self,
+        name: str,
+        vert_shader_id: str,
+        frag_shader_id: str,
+        includes: dict[str, str] | None = None,
+        **kwargs,
+    ) -> zengl.Pipeline:
+        # identical sources hit zengl's shader cache and the driver's disk cache
+        vertex_shader = self.source(f"{vert_shader_id}.vert", includes)
+        fragment_shader = self.source(f"{frag_shader_id}.frag", includes)
+        start = time.perf_counter()
+        pipeline = self.ctx.pipeline(
+            vertex_shader=vertex_shader, fragment_shader=fragment_shader, **kwargs
+        )
+        self.compile_ms[name] = (time.perf_counter() - start) * 1000
+        return pipeline
+
+    @property
+    def total_compile_ms(self) -> float:
+        return sum(self.compile_ms.values())
+
+    def report_rows(self) -> list[tuple[str, str]]:
+        rows = [("pipeline", "compile ms")]
+        rows.extend((name, f"{ms:.2f}") for name, ms in self.compile_ms.items())
+        rows.append(("total", f"{self.total_compile_ms:.2f}"))
+        return rows
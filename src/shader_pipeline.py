@@ -3,6 +3,8 @@ from typing import TYPE_CHECKING
 import zengl
 
 if TYPE_CHECKING:
+    from array import array
+
     from src.app import App
     import pygame
 
@@ -15,9 +17,15 @@ class ShaderPipeline:
         vert_shader_id: str = "default",
         frag_shader_id: str = "default",
         has_tex: bool = True,
+        image_size: tuple[int, int] | None = None,
+        image_tag: str | None = None,
+        tex_filter: str = "nearest",
+        framebuffer: list[zengl.Image] | None = None,
+        name: str | None = None,
         instance_buffer_size: int | None = None,
         instance_buffer_layout: tuple[str, int] | None = None,
-        blend: dict = {
+        includes: dict[str, str] | None = None,
+        blend: dict | None = {
             "enable": True,
             "src_color": "src_alpha",
             "dst_color": "one_minus_src_alpha",
@@ -25,33 +33,98 @@ class ShaderPipeline:
     ):
         self.app = app
         self.ctx = app.ctx
+        self.name = name or frag_shader_id
         self.has_tex = has_tex
         self.blend = blend
-        self.image = self.ctx.image(self.app.screen_size, "rgba8unorm")
+        self.tex_filter = tex_filter
+        self.resources = app.resources
+        self.image = None
+        if has_tex:
+            self.image = self.resources.image(
+                self,
+                image_size or self.app.screen_size,
+                tag=image_tag or self.name,
+            )
+        self.framebuffer = framebuffer
+        self.viewport_size = framebuffer[0].size if framebuffer else app.screen_size
         self.uniform_buffer = uniforms_buffer
         self.instance_buffer = (
-            self.ctx.buffer(size=instance_buffer_size) if instance_buffer_size else None
+            self.resources.buffer(self, instance_buffer_size)
+            if instance_buffer_size
+            else None
         )
-        layout, resources = self.get_resources_and_layout()
+        self.instance_data = None
+        self.instance_dirty = False
+        self.bytes_uploaded = 0
+        self.instance_buffer_layout = instance_buffer_layout
+        self.vert_shader_id = vert_shader_id
+        self.frag_shader_id = frag_shader_id
+        self.includes = includes
+        self.pipeline = self.create_pipeline()
+
+    @property
+    def shader_files(self) -> tuple[str, str]:
+        return f"{self.vert_shader_id}.vert", f"{self.frag_shader_id}.frag"
 
-        self.pipeline = self.ctx.pipeline(
-            vertex_shader=self.load_shader_src(f"{vert_shader_id}.vert"),
-            fragment_shader=self.load_shader_src(f"{frag_shader_id}.frag"),
+    def create_pipeline(self) -> zengl.Pipeline:
+        shaders = self.app.shaders
+        include_values = shaders.include_values(self.shader_files, self.includes)
+        layout, resources = self.get_resources_and_layout()
+        pipeline = shaders.pipeline(
+            self.name,
+            self.vert_shader_id,
+            self.frag_shader_id,
+            includes=self.includes,
             layout=layout,
             resources=resources,
-            framebuffer=None,
+            framebuffer=self.framebuffer,
             topology="triangle_strip",
-            viewport=(0, 0, *self.app.screen_size),
+            viewport=(0, 0, *self.viewport_size),
             vertex_buffers=(
-                []
-                if not instance_buffer_size
-                else zengl.bind(self.instance_buffer, *instance_buffer_layout)
+                zengl.bind(self.instance_buffer, *self.instance_buffer_layout)
+                if self.instance_buffer is not None
+                else []
             ),
             vertex_count=4,
             blend=self.blend,
-            instance_count=1 if not instance_buffer_size else 1,
+            instance_count=1,
+        )
+        self.include_values = include_values
+        return pipeline
+
+    def depends_on(self, changed_files: set[str]) -> bool:
+        if changed_files.intersection(self.shader_files):
+            return True
+        shaders = self.app.shaders
+        return self.include_values != shaders.include_values(
+            self.shader_files, self.includes
         )
 
+    def grow_instance_buffer(self, size: int):
+        # the buffer is bound into the pipeline, so the pipeline is rebuilt too
+        size = max(size, 2 * self.instance_buffer.size)
+        self.resources.release_buffer(self.instance_buffer)
+        self.instance_buffer = self.resources.buffer(self, size)
+        self.reload()
+
+    def reload(self):
+        # raises on compile errors, leaving the current pipeline in place
+        pipeline = self.create_pipeline()
+        self.ctx.release(self.pipeline)
+        self.pipeline = pipeline
+
+    def set_viewport_size(self, size: tuple[int, int]):
+        self.viewport_size = size
+        self.pipeline.viewport = (0, 0, *size)
+
+    @property
+    def gpu_bytes(self) -> tuple[int, int]:
+        return self.resources.owner_bytes(self)
+
+    def release(self):
+        self.ctx.release(self.pipeline)
+        self.resources.release(self)
+
     def get_resources_and_layout(self):
         layout = [{"name": "Common", "binding": 0}]
         resources = [
@@ -64,8 +137,8 @@ class ShaderPipeline:
                     "type": "sampler",
                     "binding": 0,
                     "image": self.image,
-                    "min_filter": "nearest",
-                    "mag_filter": "nearest",
+                    "min_filter": self.tex_filter,
+                    "mag_filter": self.tex_filter,
                     "wrap_x": "clamp_to_edge",
                     "wrap_y": "clamp_to_edge",
                 }
@@ -75,18 +148,41 @@ class ShaderPipeline:
     def render(
         self,
         screen: "pygame.Surface | None" = None,
-        instance_data: bytes | None = None,
+        instance_data: "bytes | array | None" = None,
         instance_count: int = 1,
+        dirty_rects: "list[pygame.Rect] | None" = None,
     ):
-        if instance_data:
-            self.instance_buffer.write(instance_data)
-            self.pipeline.instance_count = instance_count
+        self.bytes_uploaded = 0
+        if instance_data is not None:
+            if instance_data is not self.instance_data:
+                self.instance_data = instance_data
+                self.instance_dirty = True
+        self.pipeline.instance_count = instance_count
+        profiler = self.app.profiler
+        if self.instance_dirty:
+            with profiler.stage("instances"):
+                if self.instance_data:
+                    data = memoryview(self.instance_data).cast("B")
+                    if len(data) > self.instance_buffer.size:
+                        self.grow_instance_buffer(len(data))
+                    self.instance_buffer.write(data)
+                    self.bytes_uploaded += len(data)
+                self.instance_dirty = False
         if screen:
+            with profiler.stage("texture"):
+                self.write_screen(screen, dirty_rects)
+        with profiler.gpu_stage(self.name):
+            self.pipeline.render()
+
+    def write_screen(
+        self, screen: "pygame.Surface", dirty_rects: "list[pygame.Rect] | None"
+    ):
+        if dirty_rects is None or screen.get_rect() in dirty_rects:
             screen_buffer = screen.get_view("0").raw
             self.image.write(screen_buffer)
-        self.pipeline.render()
-
-    @staticmethod
-    def load_shader_src(shader_name: str) -> str:
-        with open(f"src/shaders/{shader_name}") as f:
-            return f.read()
+            self.bytes_uploaded += len(screen_buffer)
+            return
+        for rect in dirty_rects:
+            rect_buffer = screen.subsurface(rect).copy().get_view("0").raw
+            self.image.write(rect_buffer, size=rect.size, offset=rect.topleft)
+            self.bytes_uploaded += len(rect_buffer)
@@ -0,0 +1,55 @@
+from typing import TYPE_CHECKING
+import time
+
+if TYPE_CHECKING:
+    from src.app import App
+    from src.shader_pipeline import ShaderPipeline
+
+
+class ShaderReloader:
+    def __init__(self, app: "App", interval: float = 0.5, samples: int = 60):
+        self.app = app
+        self.interval = interval
+        self.samples = samples
+        self.last_poll_time = time.perf_counter()
+        self.pending = []
+        app.profiler.keep_gpu_timing = True
+
+    @property
+    def timings(self) -> dict:
+        profiler = self.app.profiler
+        return profiler.gpu_times if profiler.gpu_timer else profiler.cpu_times
+
+    def update(self):
+        self.report_timings()
+        now = time.perf_counter()
+        if now - self.last_poll_time < self.interval:
+            return
+        self.last_poll_time = now
+        changed = self.app.shaders.poll()
+        for pipeline in self.app.pipelines:
+            if pipeline.depends_on(changed):
+                self.reload(pipeline)
+
+    def reload(self, pipeline: "ShaderPipeline"):
+        try:
+            pipeline.reload()
+        except (KeyError, ValueError) as error:
+            print(f"{pipeline.name}: keeping the previous shader\n{error}")
+            return
+        compile_ms = self.app.shaders.compile_ms[pipeline.name]
+        print(f"{pipeline.name}: reloaded in {compile_ms:.1f} ms")
+        # only average samples taken with the new shader
+        self.timings.pop(pipeline.name, None)
+        if pipeline not in self.pending:
+            self.pending.append(pipeline)
+
+    def report_timings(self):
+        kind = "GPU" if self.app.profiler.gpu_timer else "CPU"
+        for pipeline in self.pending.copy():
+            samples = self.timings.get(pipeline.name)
+            if not samples or len(samples) < self.samples:
+                continue
+            mean_ms = sum(samples) / len(samples)
+            print(f"{pipeline.name}: {mean_ms:.3f} ms {kind} over {len(samples)} runs")
+            self.pending.remove(pipeline)
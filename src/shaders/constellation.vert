@@ -3,10 +3,10 @@ precision highp float;
 precision highp int;
 
 #include "uniforms"
-#include "iResolution"
 
 layout(location = 0) in vec2 in_pos;
 layout(location = 1) in float in_brightness;
+layout(location = 2) in float in_kind;
 
 vec2 vertex[4] = vec2[](
     vec2(-1.0, -1.0),
@@ -18,10 +18,12 @@ vec2 vertex[4] = vec2[](
 out vec2 fragCoord;
 out vec2 out_pos;
 out float out_bright;
+flat out int out_kind;
 
 void main() {
     fragCoord = vertex[gl_VertexID] * vec2(0.5, -0.5) + 0.5;
     gl_Position = vec4(vertex[gl_VertexID], 0.0, 1.0);
     out_pos = in_pos;
     out_bright = in_brightness;
+    out_kind = int(in_kind);
 }
\ No newline at end of file
@@ -0,0 +1,74 @@
+#version 300 es
+precision highp float;
+precision highp int;
+
+#include "uniforms"
+#include "starRadius"
+#include "proceduralStars"
+
+vec2 vertex[4] = vec2[](
+    vec2(-1.0, -1.0),
+    vec2(-1.0, 1.0),
+    vec2(1.0, -1.0),
+    vec2(1.0, 1.0)
+);
+
+// smallest magnitude of the uv scale used by star(): 2.0 * (cos(iTime) - 11.5)
+const float MIN_UV_SCALE = 21.0;
+
+out vec2 fragCoord;
+out vec2 out_pos;
+out float out_bright;
+flat out int out_kind;
+
+// mirrored by hash_u32 and procedural_star in src/starfield.py
+uint hash_u32(uint x) {
+    x ^= x >> 16u;
+    x *= 0x7feb352du;
+    x ^= x >> 15u;
+    x *= 0x846ca68bu;
+    x ^= x >> 16u;
+    return x;
+}
+
+uint star_hash(uint index, uint attempt, uint component) {
+    return hash_u32(starSeed ^ hash_u32(index * 64u + attempt * 4u + component));
+}
+
+bool excluded(ivec2 pos) {
+    for (int i = 0; i < excludeRects.length(); i++) {
+        ivec4 rect = excludeRects[i];
+        if (pos.x >= rect.x && pos.x < rect.z && pos.y >= rect.y && pos.y < rect.w) {
+            return true;
+        }
+    }
+    return false;
+}
+
+void main() {
+    uint index = uint(gl_InstanceID);
+    vec2 pos = vec2(0.0);
+    float brightness = 0.0;
+    for (uint attempt = 0u; attempt < MAX_STAR_ATTEMPTS; attempt++) {
+        ivec2 star = starArea.xy + ivec2(
+            int(((star_hash(index, attempt, 0u) >> 16u) * uint(starArea.z)) >> 16u),
+            int(((star_hash(index, attempt, 1u) >> 16u) * uint(starArea.w)) >> 16u)
+        );
+        if (!excluded(star)) {
+            float u = float(star_hash(index, attempt, 2u) >> 8u) / 16777216.0;
+            pos = vec2(star);
+            brightness = RANDOM_STAR_BRIGHTNESS.x + RANDOM_STAR_BRIGHTNESS.y * u;
+            break;
+        }
+    }
+
+    vec2 center = pos / iResolution;
+    vec2 half_size = brightness > 0.0
+        ? vec2(STAR_RADIUS_SCALE[RANDOM_STAR] * brightness / MIN_UV_SCALE) + 1.0 / iResolution
+        : vec2(0.0);
+    fragCoord = center + vertex[gl_VertexID] * half_size;
+    gl_Position = vec4(fragCoord.x * 2.0 - 1.0, 1.0 - fragCoord.y * 2.0, 0.0, 1.0);
+    out_pos = pos;
+    out_bright = brightness;
+    out_kind = RANDOM_STAR;
+}
@@ -3,7 +3,6 @@ precision highp float;
 precision highp int;
 
 #include "uniforms"
-#include "iResolution"
 
 vec2 vertex[4] = vec2[](
     vec2(-1.0, -1.0),
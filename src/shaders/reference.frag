@@ -0,0 +1,28 @@
+#version 300 es
+precision highp float;
+precision highp int;
+
+#include "uniforms"
+#include "referenceShape"
+
+in vec2 out_pos;
+flat in vec4 out_segment;
+flat in int out_kind;
+
+out vec4 fragColor;
+
+float segment_distance(vec2 pos, vec2 start, vec2 end) {
+    vec2 dir = end - start;
+    float t = clamp(dot(pos - start, dir) / max(dot(dir, dir), 1e-6), 0.0, 1.0);
+    return length(pos - start - dir * t);
+}
+
+void main() {
+    if (out_kind == REFERENCE_FILL) {
+        fragColor = REFERENCE_FILL_COLOR;
+        return;
+    }
+    float dist = segment_distance(out_pos, out_segment.xy, out_segment.zw);
+    float coverage = clamp(REFERENCE_LINE_WIDTH * 0.5 + 0.5 - dist, 0.0, 1.0);
+    fragColor = vec4(REFERENCE_LINE_COLOR.rgb, REFERENCE_LINE_COLOR.a * coverage);
+}
@@ -0,0 +1,43 @@
+#version 300 es
+precision highp float;
+precision highp int;
+
+#include "uniforms"
+#include "referenceShape"
+
+layout(location = 0) in vec4 in_segment;
+layout(location = 1) in float in_kind;
+
+vec2 vertex[4] = vec2[](
+    vec2(-1.0, -1.0),
+    vec2(-1.0, 1.0),
+    vec2(1.0, -1.0),
+    vec2(1.0, 1.0)
+);
+
+out vec2 out_pos;
+flat out vec4 out_segment;
+flat out int out_kind;
+
+void main() {
+    vec2 start = referenceOffset + in_segment.xy;
+    vec2 end = referenceOffset + in_segment.zw;
+    vec2 pos;
+    if (int(in_kind) == REFERENCE_FILL) {
+        // fan triangle from the shape center, the last vertex is degenerate
+        vec2 fan[4] = vec2[](referenceOffset, start, end, end);
+        pos = fan[gl_VertexID];
+    } else {
+        // quad around the segment, padded a pixel for the antialiased edge
+        vec2 dir = end - start;
+        dir = length(dir) > 0.0 ? normalize(dir) : vec2(1.0, 0.0);
+        vec2 normal = vec2(-dir.y, dir.x);
+        float extent = REFERENCE_LINE_WIDTH * 0.5 + 1.0;
+        vec2 corner = vertex[gl_VertexID];
+        pos = (corner.x < 0.0 ? start - dir * extent : end + dir * extent) + normal * corner.y * extent;
+    }
+    gl_Position = vec4(pos.x / iResolution.x * 2.0 - 1.0, 1.0 - pos.y / iResolution.y * 2.0, 0.0, 1.0);
+    out_pos = pos;
+    out_segment = vec4(start, end);
+    out_kind = int(in_kind);
+}
@@ -5,7 +5,6 @@ precision highp int;
 // adapted from https://www.youtube.com/watch?v=rvDo9LvfoVE
 
 #include "uniforms"
-#include "iResolution"
 
 in vec2 fragCoord;
 out vec4 fragColor;
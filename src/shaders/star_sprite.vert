@@ -0,0 +1,35 @@
+#version 300 es
+precision highp float;
+precision highp int;
+
+#include "uniforms"
+#include "starRadius"
+
+layout(location = 0) in vec2 in_pos;
+layout(location = 1) in float in_brightness;
+layout(location = 2) in float in_kind;
+
+vec2 vertex[4] = vec2[](
+    vec2(-1.0, -1.0),
+    vec2(-1.0, 1.0),
+    vec2(1.0, -1.0),
+    vec2(1.0, 1.0)
+);
+
+// smallest magnitude of the uv scale used by star(): 2.0 * (cos(iTime) - 11.5)
+const float MIN_UV_SCALE = 21.0;
+
+out vec2 fragCoord;
+out vec2 out_pos;
+out float out_bright;
+flat out int out_kind;
+
+void main() {
+    vec2 center = in_pos / iResolution;
+    vec2 half_size = vec2(STAR_RADIUS_SCALE[int(in_kind)] * in_brightness / MIN_UV_SCALE) + 1.0 / iResolution;
+    fragCoord = center + vertex[gl_VertexID] * half_size;
+    gl_Position = vec4(fragCoord.x * 2.0 - 1.0, 1.0 - fragCoord.y * 2.0, 0.0, 1.0);
+    out_pos = in_pos;
+    out_bright = in_brightness;
+    out_kind = int(in_kind);
+}
@@ -3,11 +3,12 @@ precision highp float;
 precision highp int;
 
 #include "uniforms"
-#include "iResolution"
+#include "starRadius"
 
 in vec2 fragCoord;
 in vec2 out_pos;
 in float out_bright;
+flat in int out_kind;
 out vec4 fragColor;
 
 const vec2 smooth_edges = vec2(0.02); 
@@ -51,9 +52,16 @@ void main()
     vec2 pos = out_pos / iResolution.xy;
     uv = (uv - pos) * (2.0 * (cos(iTime) - 11.5)); 
 
-    float radius = 25.25 * out_bright;
+    float radius = STAR_RADIUS_SCALE[out_kind] * out_bright;
     float anim = sin(iTime * 11.0) * 0.1 + 1.0;
 
+    if (out_kind == CONSTELLATION_STAR) {
+        // additive: blended as src + dst
+        color = star(uv, anim, radius) * vec3(0.0214 + out_bright);
+        fragColor = vec4(color, 0.0);
+        return;
+    }
+
     vec2 rect_min = vec2(constellationRect[0], constellationRect[1]) / iResolution;
     vec2 rect_max = vec2(constellationRect[0] + constellationRect[2], constellationRect[1] + constellationRect[3]) / iResolution;
 
@@ -61,5 +69,6 @@ void main()
 
     color = star(uv, anim, radius) * vec3(0.0514 + out_bright) * visibility;
 
-    fragColor = vec4(color, color);
+    // premultiplied alpha: blended as src * a + dst * (1 - a)
+    fragColor = vec4(color * color.r, color.r);
 }
@@ -0,0 +1,15 @@
+#version 300 es
+precision highp float;
+precision highp int;
+
+uniform sampler2D Texture;
+
+#include "uniforms"
+
+in vec2 fragCoord;
+in vec4 out_colour;
+out vec4 fragColor;
+
+void main() {
+    fragColor = vec4(out_colour.rgb, out_colour.a * texture(Texture, fragCoord).a);
+}
@@ -0,0 +1,27 @@
+#version 300 es
+precision highp float;
+precision highp int;
+
+#include "uniforms"
+
+layout(location = 0) in vec4 in_rect;
+layout(location = 1) in vec4 in_uv_rect;
+layout(location = 2) in vec4 in_colour;
+
+vec2 vertex[4] = vec2[](
+    vec2(0.0, 0.0),
+    vec2(0.0, 1.0),
+    vec2(1.0, 0.0),
+    vec2(1.0, 1.0)
+);
+
+out vec2 fragCoord;
+out vec4 out_colour;
+
+void main() {
+    vec2 corner = vertex[gl_VertexID];
+    vec2 pos = (in_rect.xy + corner * in_rect.zw) / iResolution;
+    fragCoord = in_uv_rect.xy + corner * in_uv_rect.zw;
+    out_colour = in_colour;
+    gl_Position = vec4(pos.x * 2.0 - 1.0, 1.0 - pos.y * 2.0, 0.0, 1.0);
+}
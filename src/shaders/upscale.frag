@@ -0,0 +1,19 @@
+#version 300 es
+precision highp float;
+precision highp int;
+
+uniform sampler2D Texture;
+
+#include "uniforms"
+
+in vec2 fragCoord;
+out vec4 fragColor;
+
+void main() {
+    // offscreen images are rendered bottom-up, fragCoord runs top-down
+    vec2 uv = vec2(fragCoord.x, 1.0 - fragCoord.y) * backgroundScale;
+    // only the bottom-left backgroundScale of the image holds the background
+    vec2 half_texel = 0.5 / vec2(textureSize(Texture, 0));
+    uv = clamp(uv, half_texel, backgroundScale - half_texel);
+    fragColor = vec4(texture(Texture, uv).rgb, 1.0);
+}
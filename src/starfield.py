@@ -0,0 +1,111 @@
+from array import array
+from itertools import compress, repeat
+import random
+
+import pygame
+
+FLOATS_PER_STAR = 4
+RANDOM_STAR_BRIGHTNESS = (0.0005, 0.015)
+# procedural stars resample positions inside an excluded rect this many times
+# before giving up on the star, must match procedural_stars.vert
+MAX_STAR_ATTEMPTS = 8
+
+
+def random_floats(rng: random.Random, n: int, low: float, high: float) -> list[float]:
+    # 16 bit steps are well below a pixel even at 4K
+    values = map(((high - low) / 65536).__mul__, array("H", rng.randbytes(2 * n)))
+    return list(map(float(low).__add__, values) if low else values)
+
+
+def generate_star_field(
+    rng: random.Random,
+    count: int,
+    area: pygame.Rect,
+    exclude: list[pygame.Rect],
+    brightness_range: tuple[float, float],
+    kind: int,
+) -> array:
+    exclude = [rect for rect in exclude if area.colliderect(rect)]
+    xs = []
+    ys = []
+    empty_batches = 0
+    while len(xs) < count:
+        missing = count - len(xs)
+        # oversample so rejected points rarely need another batch
+        batch = missing + missing // 4 + 16
+        batch_xs = random_floats(rng, batch, area.left, area.right)
+        batch_ys = random_floats(rng, batch, area.top, area.bottom)
+        keep = None
+        for rect in exclude:
+            left, top, right, bottom = rect.left, rect.top, rect.right, rect.bottom
+            outside = [
+                x < left or x >= right or y < top or y >= bottom
+                for x, y in zip(batch_xs, batch_ys)
+            ]
+            keep = outside if keep is None else list(map(min, keep, outside))
+        if keep is None:
+            keep = repeat(True)
+        kept_before = len(xs)
+        xs.extend(compress(batch_xs, keep))
+        ys.extend(compress(batch_ys, keep))
+        empty_batches = empty_batches + 1 if len(xs) == kept_before else 0
+        if empty_batches > 8:
+            raise ValueError(f"{area} is covered by the excluded regions")
+    del xs[count:]
+    del ys[count:]
+
+    data = array("f", bytes(4 * FLOATS_PER_STAR * count))
+    data[0::FLOATS_PER_STAR] = array("f", xs)
+    data[1::FLOATS_PER_STAR] = array("f", ys)
+    data[2::FLOATS_PER_STAR] = array("f", random_floats(rng, count, *brightness_range))
+    data[3::FLOATS_PER_STAR] = array("f", [kind]) * count
+    return data
+
+
+def f32(value: float) -> float:
+    return array("f", (value,))[0]
+
+
+def hash_u32(x: int) -> int:
+    x ^= x >> 16
+    x = (x * 0x7FEB352D) & 0xFFFFFFFF
+    x ^= x >> 15
+    x = (x * 0x846CA68B) & 0xFFFFFFFF
+    x ^= x >> 16
+    return x
+
+
+def star_hash(seed: int, index: int, attempt: int, component: int) -> int:
+    return hash_u32(
+        seed ^ hash_u32((index * 64 + attempt * 4 + component) & 0xFFFFFFFF)
+    )
+
+
+def procedural_star(
+    seed: int,
+    index: int,
+    area: pygame.Rect,
+    exclude: list[pygame.Rect],
+) -> tuple[int, int, float]:
+    low, high = RANDOM_STAR_BRIGHTNESS
+    for attempt in range(MAX_STAR_ATTEMPTS):
+        x = area.x + ((star_hash(seed, index, attempt, 0) >> 16) * area.w >> 16)
+        y = area.y + ((star_hash(seed, index, attempt, 1) >> 16) * area.h >> 16)
+        if not any(rect.collidepoint(x, y) for rect in exclude):
+            u = f32((star_hash(seed, index, attempt, 2) >> 8) / 16777216)
+            brightness = f32(f32(low) + f32(f32(high - low) * u))
+            return x, y, brightness
+    return 0, 0, 0.0
+
+
+def generate_procedural_star_field(
+    seed: int,
+    count: int,
+    area: pygame.Rect,
+    exclude: list[pygame.Rect],
+    kind: int,
+) -> array:
+    data = array("f")
+    for index in range(count):
+        data.extend((*procedural_star(seed, index, area, exclude), kind))
+    return data
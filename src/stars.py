@@ -1,4 +1,5 @@
 from typing import TYPE_CHECKING
+from array import array
 import math
 import random
 
@@ -6,14 +7,29 @@ import pygame
 
 if TYPE_CHECKING:
     from src.app import App
+    from src.level_pack import PackedLevel
 
 import src.constants as constants
+from src.starfield import (
+    RANDOM_STAR_BRIGHTNESS,
+    generate_procedural_star_field,
+    generate_star_field,
+)
+
+CONSTELLATION_STAR = 0
+RANDOM_STAR = 1
+REFERENCE_FILL = 0
+REFERENCE_LINE = 1
+FLOATS_PER_REFERENCE_SEGMENT = 5
+REFERENCE_FILL_COLOUR = (255, 0, 0, 100)
+REFERENCE_LINE_WIDTH = 2
 
 
 class Stars:
     def __init__(
         self,
         app: "App",
+        rng: random.Random,
         star_max_radius: int,
         star_min_radius: int,
         constellation_max_radius: int,
@@ -21,8 +37,10 @@ class Stars:
         num_constellation_points: int,
         num_random_points: int,
         max_random_points: int,
+        packed_level: "PackedLevel | None" = None,
     ):
         self.app = app
+        self.rng = rng
         self.star_max_radius = star_max_radius
         self.star_min_radius = star_min_radius
         self.constellation_max_radius = constellation_max_radius
@@ -32,11 +50,29 @@ class Stars:
         )
         self.num_random_points = max(3, min(num_random_points, max_random_points))
         self.match_threshold = self.app.screen_w // 50
-        self.init_constellation()
-        self.init_reference()
-        self.init_all_stars()
+        if packed_level:
+            self.init_packed_level(packed_level)
+        else:
+            self.init_constellation()
+            self.init_reference()
+            self.init_all_stars()
+            if not self.app.headless:
+                self.init_reference_instances()
         self.reset_reference_pos()
-        self.init_draw()
+
+    def init_packed_level(self, level: "PackedLevel"):
+        # the level was generated offline, so the star arrays point into the pack
+        self.shape_center = level.shape_center
+        self.reference_points = level.reference_points
+        self.constellation_rect = pygame.Rect(level.constellation_rect)
+        self.constellation_center_pos = self.constellation_rect.center
+        self.init_reference()
+        self.init_star_area()
+        self.star_seed = level.star_seed
+        self.instance_data = level.instance_data
+        self.num_stars = level.num_stars
+        self.reference_instance_data = level.reference_instance_data
+        self.reference_instance_count = 2 * len(self.reference_points)
 
     def draw_reference(self, screen: pygame.Surface):
         pygame.draw.rect(
@@ -52,47 +88,88 @@ class Stars:
             width=self.app.screen_w // 200,
             border_radius=self.app.screen_w // 24,
         )
-        screen.blit(self.reference_surf, self.reference_rect)
 
-    def init_all_stars(self):
+    def init_star_area(self):
         gui = self.app.game.gui
-        self.random_points = [
-            point
-            for point in self.generate_random_points(self.num_random_points)
-            if not self.constellation_rect.collidepoint(point)
-            and not gui.bottom_panel_rect.collidepoint(point)
-        ]
+        self.star_area = pygame.Rect(0, 0, self.app.screen_w, gui.bottom_panel_rect.top)
+        self.star_exclude = [self.constellation_rect, gui.bottom_panel_rect]
+
+    def init_all_stars(self):
         self.constellation_points = self.move_and_scale_points(
             self.constellation_points,
             self.constellation_center_pos,
             1,
         )
-        self.all_points = self.constellation_points + self.random_points
         self.const_brightnesses = [
-            random.uniform(0.005, 0.015) for _ in range(len(self.constellation_points))
-        ]
-        self.const_points_and_brightnesses = [
-            (*point, brightness)
-            for point, brightness in zip(
-                self.constellation_points, self.const_brightnesses
-            )
-        ]
-        self.rand_brightnesses = [
-            random.uniform(0.0005, 0.015) for _ in range(len(self.random_points))
-        ]
-        self.rand_points_and_brightnesses = [
-            (*point, brightness)
-            for point, brightness in zip(self.random_points, self.rand_brightnesses)
+            self.rng.uniform(0.005, 0.015)
+            for _ in range(len(self.constellation_points))
         ]
+        self.instance_data = self.pack_instance_data(
+            self.constellation_points, self.const_brightnesses, CONSTELLATION_STAR
+        )
+        self.init_star_area()
+        if constants.PROCEDURAL_STARS:
+            # random stars are hashed from this seed in procedural_stars.vert
+            self.star_seed = self.rng.getrandbits(32)
+            self.num_stars = len(self.constellation_points)
+            return
+        self.star_seed = 0
+        self.random_star_data = generate_star_field(
+            self.rng,
+            self.num_random_points,
+            self.star_area,
+            self.star_exclude,
+            RANDOM_STAR_BRIGHTNESS,
+            RANDOM_STAR,
+        )
+        self.instance_data += self.random_star_data
+        self.num_stars = len(self.constellation_points) + self.num_random_points
+
+    def procedural_star_data(self) -> array:
+        # CPU mirror of the procedural stars, for hit-testing and comparisons
+        return generate_procedural_star_field(
+            self.star_seed,
+            self.num_random_points,
+            self.star_area,
+            self.star_exclude,
+            RANDOM_STAR,
+        )
+
+    @staticmethod
+    def pack_instance_data(
+        points: list[tuple[float, float]], brightnesses: list[float], kind: int
+    ) -> array:
+        return array(
+            "f",
+            [
+                value
+                for point, brightness in zip(points, brightnesses)
+                for value in (*point, brightness, kind)
+            ],
+        )
 
-    def init_draw(self):
-        pygame.draw.polygon(
-            self.reference_surf,
-            (255, 0, 0, 100),
-            self.reference_points,
+    def init_reference_instances(self):
+        # one fan triangle from the shape center and one line per edge, drawn
+        # by the reference pipeline at reference_offset
+        cx, cy = self.shape_center
+        points = [(x - cx, y - cy) for x, y in self.reference_points]
+        edges = list(zip(points, points[1:] + points[:1]))
+        self.reference_instance_data = array(
+            "f",
+            [
+                value
+                for kind in (REFERENCE_FILL, REFERENCE_LINE)
+                for start, end in edges
+                for value in (*start, *end, kind)
+            ],
         )
-        self.draw_connecting_lines(
-            self.reference_surf, self.reference_points, constants.RED
+        self.reference_instance_count = 2 * len(edges)
+
+    @property
+    def reference_offset(self) -> tuple[int, int]:
+        return (
+            self.reference_rect.x + self.shape_center[0],
+            self.reference_rect.y + self.shape_center[1],
         )
 
     def init_bg(self):
@@ -105,7 +182,7 @@ class Stars:
         )
         self.background_surf.fill((0, 0, 0, 0))
         self.background_sizes = [
-            random.randint(self.star_min_radius, self.star_max_radius)
+            self.rng.randint(self.star_min_radius, self.star_max_radius)
             for _ in range(self.num_random_points)
         ]
 
@@ -116,34 +193,25 @@ class Stars:
 
     def init_constellation(self):
         gui = self.app.game.gui
-        self.constellation_points = self.generate_random_shape_points(
-            (
-                self.constellation_max_radius + self.star_max_radius * 2,
-                self.constellation_max_radius + self.star_max_radius * 2,
-            )
+        self.shape_center = (
+            self.constellation_max_radius + self.star_max_radius * 2,
+            self.constellation_max_radius + self.star_max_radius * 2,
         )
+        self.constellation_points = self.generate_random_shape_points(self.shape_center)
         self.constellation_rect = self.get_rect_from_points(self.constellation_points)
-        self.constellation_surf = pygame.Surface(
-            (
-                self.constellation_rect.w + self.star_max_radius,
-                self.constellation_rect.h + self.star_max_radius,
-            ),
-            pygame.SRCALPHA,
-        )
-        self.constellation_center_pos = random.randint(
+        self.constellation_center_pos = self.rng.randint(
             self.constellation_rect.w // 2,
             self.app.screen_w - self.constellation_rect.w,
-        ), random.randint(
+        ), self.rng.randint(
             self.constellation_rect.h // 2,
             gui.bottom_panel_rect.top - self.constellation_rect.h,
         )
         self.constellation_rect.center = self.constellation_center_pos
+        self.reference_points = self.constellation_points.copy()
 
     def init_reference(self):
         gui = self.app.game.gui
-        self.reference_points = self.constellation_points.copy()
         self.reference_rect = self.constellation_rect.copy()
-        self.reference_surf = self.constellation_surf.copy()
         self.reference_start_pos = (
             self.app.screen_w // 2 - gui.bottom_panel_rect.h // 2,
             gui.bottom_panel_rect.top,
@@ -166,23 +234,8 @@ class Stars:
             border_radius=self.app.screen_w // 24,
         )
 
-    def draw_connecting_lines(
-        self, surf: pygame.Surface, points: list[tuple[int, int]], color: tuple
-    ):
-        num_points = len(points)
-        lines = [
-            (
-                points[i],
-                points[(i + 1) % num_points],
-            )
-            for i in range(num_points)
-        ]
-        for line in lines:
-            pygame.draw.line(surf, color, line[0], line[1], 2)
-
-    def move_reference_pos(self, dx: int, dy: int):
-        self.reference_rect.x += dx
-        self.reference_rect.y += dy
+    def set_reference_pos(self, pos: tuple[int, int]):
+        self.reference_rect.topleft = pos
 
     def reset_reference_pos(self):
         self.reference_rect.topleft = self.reference_start_pos
@@ -196,8 +249,8 @@ class Stars:
         angle_increment = 2 * math.pi / n
 
         for i in range(n):
-            radius = random.uniform(max_radius * 0.5, max_radius)
-            angle = i * angle_increment + random.uniform(-0.2, 0.2)
+            radius = self.rng.uniform(max_radius * 0.5, max_radius)
+            angle = i * angle_increment + self.rng.uniform(-0.2, 0.2)
 
             x = center[0] + int(radius * math.cos(angle))
             y = center[1] + int(radius * math.sin(angle))
@@ -225,19 +278,6 @@ class Stars:
 
         return moved_scaled_points
 
-    def generate_random_points(self, n: int) -> list[tuple[int, int]]:
-        return [
-            (
-                float(random.randint(0, self.app.screen_w)),
-                float(
-                    random.randint(
-                        0, self.app.screen_h - self.app.game.gui.bottom_panel_rect.h
-                    )
-                ),
-            )
-            for _ in range(n)
-        ]
-
     def shapes_are_matched(self) -> bool:
         distance = math.sqrt(
             (self.reference_rect.centerx - self.constellation_rect.centerx) ** 2
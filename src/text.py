@@ -0,0 +1,200 @@
+from typing import TYPE_CHECKING
+from array import array
+from collections import OrderedDict
+import functools
+import string
+import threading
+
+import pygame
+
+if TYPE_CHECKING:
+    from src.assets import AssetManager
+
+import src.constants as constants
+
+ASCII_CHARS = string.ascii_letters + string.digits + string.punctuation + " "
+FLOATS_PER_GLYPH = 12
+
+
+def locked(method):
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self.lock:
+            return method(self, *args, **kwargs)
+
+    return wrapper
+
+
+class GlyphAtlas:
+    def __init__(
+        self,
+        font_path: str,
+        assets: "AssetManager",
+        size: tuple[int, int] = (512, 512),
+    ):
+        self.font_path = font_path
+        self.assets = assets
+        self.size = size
+        self.surf = pygame.Surface(size, pygame.SRCALPHA)
+        self.surf.fill((255, 255, 255, 0))
+        self.glyphs = {}
+        self.shelf_x = 0
+        self.shelf_y = 0
+        self.shelf_h = 0
+        self.version = 0
+
+    def get_font(self, font_size: int) -> pygame.Font:
+        return self.assets.font(self.font_path, font_size)
+
+    def get_glyph(self, char: str, font_size: int) -> pygame.Rect:
+        key = (char, font_size)
+        glyph = self.glyphs.get(key)
+        if glyph is None:
+            glyph = self.glyphs[key] = self.add_glyph(char, font_size)
+        return glyph
+
+    def add_glyph(self, char: str, font_size: int) -> pygame.Rect:
+        glyph_surf = self.get_font(font_size).render(char, True, constants.WHITE)
+        w, h = glyph_surf.get_size()
+        if self.shelf_x + w > self.size[0]:
+            self.shelf_x = 0
+            self.shelf_y += self.shelf_h + 1
+            self.shelf_h = 0
+        if self.shelf_y + h > self.size[1]:
+            raise ValueError(f"Glyph atlas is full, cannot add {char!r}")
+        glyph = pygame.Rect(self.shelf_x, self.shelf_y, w, h)
+        self.surf.blit(glyph_surf, glyph, special_flags=pygame.BLEND_RGBA_MAX)
+        self.shelf_x += w + 1
+        self.shelf_h = max(self.shelf_h, h)
+        self.version += 1
+        return glyph
+
+
+class TextLayout:
+    def __init__(
+        self, glyphs: list[tuple[pygame.Rect, int, int]], size: tuple[int, int]
+    ):
+        self.glyphs = glyphs
+        self.size = size
+
+
+class TextRenderer:
+    def __init__(
+        self,
+        font_path: str,
+        assets: "AssetManager",
+        max_cached_layouts: int = 256,
+        max_cached_surfs: int = 32,
+        atlas_size: tuple[int, int] = (512, 512),
+    ):
+        self.atlas = GlyphAtlas(font_path, assets, atlas_size)
+        self.layouts = OrderedDict()
+        self.surfs = OrderedDict()
+        self.max_cached_layouts = max_cached_layouts
+        self.max_cached_surfs = max_cached_surfs
+        # levels are prepared on a worker thread while the frame thread draws
+        self.lock = threading.RLock()
+
+    @staticmethod
+    def cache_get(cache: OrderedDict, key):
+        value = cache.get(key)
+        if value is not None:
+            cache.move_to_end(key)
+        return value
+
+    @staticmethod
+    def cache_put(cache: OrderedDict, key, value, max_size: int):
+        cache[key] = value
+        if len(cache) > max_size:
+            cache.popitem(last=False)
+
+    @locked
+    def preload(self, font_size: int, chars: str = ASCII_CHARS):
+        for char in chars:
+            self.atlas.get_glyph(char, font_size)
+
+    def get_width(self, text: str, font_size: int) -> int:
+        return sum(self.atlas.get_glyph(char, font_size).w for char in text)
+
+    def wrap_lines(self, text: str, font_size: int, wraplength: int) -> list[str]:
+        if not wraplength:
+            return text.split("\n")
+        lines = []
+        for paragraph in text.split("\n"):
+            line = ""
+            for word in paragraph.split(" "):
+                candidate = f"{line} {word}" if line else word
+                if line and self.get_width(candidate, font_size) > wraplength:
+                    lines.append(line)
+                    line = word
+                else:
+                    line = candidate
+            lines.append(line)
+        return lines
+
+    @locked
+    def layout(self, text: str, font_size: int, wraplength: int = 0) -> TextLayout:
+        key = (text, font_size, wraplength)
+        text_layout = self.cache_get(self.layouts, key)
+        if text_layout is not None:
+            return text_layout
+
+        font = self.atlas.get_font(font_size)
+        glyphs = []
+        width = 0
+        lines = self.wrap_lines(text, font_size, wraplength)
+        for line_index, line in enumerate(lines):
+            x = 0
+            y = line_index * font.get_linesize()
+            for char in line:
+                glyph = self.atlas.get_glyph(char, font_size)
+                glyphs.append((glyph, x, y))
+                x += glyph.w
+            width = max(width, x)
+        height = font.get_height() + (len(lines) - 1) * font.get_linesize()
+        text_layout = TextLayout(glyphs, (width, height))
+        self.cache_put(self.layouts, key, text_layout, self.max_cached_layouts)
+        return text_layout
+
+    @locked
+    def render(
+        self, text: str, font_size: int, colour: tuple, wraplength: int = 0
+    ) -> pygame.Surface:
+        key = (text, font_size, colour, wraplength)
+        surf = self.cache_get(self.surfs, key)
+        if surf is not None:
+            return surf
+
+        text_layout = self.layout(text, font_size, wraplength)
+        surf = pygame.Surface(text_layout.size, pygame.SRCALPHA)
+        surf.fill((255, 255, 255, 0))
+        for glyph, x, y in text_layout.glyphs:
+            surf.blit(self.atlas.surf, (x, y), glyph, pygame.BLEND_RGBA_MAX)
+        surf.fill((*colour[:3], 255), special_flags=pygame.BLEND_RGBA_MULT)
+        self.cache_put(self.surfs, key, surf, self.max_cached_surfs)
+        return surf
+
+    @locked
+    def instance_data(
+        self,
+        items: list[tuple[str, int, tuple, tuple[int, int], int]],
+    ) -> array:
+        atlas_w, atlas_h = self.atlas.size
+        data = array("f")
+        for text, font_size, colour, pos, wraplength in items:
+            rgba = [channel / 255 for channel in (*colour[:3], 255)]
+            for glyph, x, y in self.layout(text, font_size, wraplength).glyphs:
+                data.extend(
+                    (
+                        pos[0] + x,
+                        pos[1] + y,
+                        glyph.w,
+                        glyph.h,
+                        glyph.x / atlas_w,
+                        glyph.y / atlas_h,
+                        glyph.w / atlas_w,
+                        glyph.h / atlas_h,
+                        *rgba,
+                    )
+                )
+        return data
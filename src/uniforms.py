@@ -0,0 +1,149 @@
+import re
+import struct
+
+# glsl type: (struct format, base alignment, size) in std140 layout
+STD140_TYPES = {
+    "float": ("f", 4, 4),
+    "int": ("i", 4, 4),
+    "uint": ("I", 4, 4),
+    "bool": ("I", 4, 4),
+    "vec2": ("2f", 8, 8),
+    "vec3": ("3f", 16, 12),
+    "vec4": ("4f", 16, 16),
+    "ivec2": ("2i", 8, 8),
+    "ivec3": ("3i", 16, 12),
+    "ivec4": ("4i", 16, 16),
+    "mat4": ("16f", 16, 64),
+}
+ARRAY_TYPE = re.compile(r"^(\w+)\[(\d+)\]$")
+
+
+def align_up(offset: int, align: int) -> int:
+    return (offset + align - 1) // align * align
+
+
+class UniformStruct:
+    def __init__(self, name: str, fields: dict):
+        self.name = name
+        self.fields = fields
+
+
+class UniformField:
+    def __init__(self, offset: int, glsl_type: str):
+        fmt, _, self.size = STD140_TYPES[glsl_type]
+        self.offset = offset
+        self.format = struct.Struct(fmt)
+        self.is_scalar = len(fmt) == 1
+
+
+class UniformBlock:
+    def __init__(self, fields: dict, name: str = "Common"):
+        self.name = name
+        self.fields = {}
+        self.values = {}
+        self.structs = {}
+        self.layout = []
+        size = self.add_fields(fields, "", 0, self.layout, self.fields)
+        self.size = max(16, align_up(size, 16))
+        self.data = bytearray(self.size)
+        self.dirty_start = 0
+        self.dirty_end = self.size
+
+    def add_fields(
+        self,
+        fields: dict,
+        prefix: str,
+        offset: int,
+        layout: list,
+        leaves: dict | None,
+    ) -> int:
+        for name, field_type in fields.items():
+            length = None
+            if isinstance(field_type, tuple):
+                field_type, length = field_type
+            elif isinstance(field_type, str) and (
+                match := ARRAY_TYPE.match(field_type)
+            ):
+                field_type, length = match.group(1), int(match.group(2))
+
+            if isinstance(field_type, UniformStruct):
+                glsl_type = field_type.name
+                align = 16
+                stride = align_up(self.struct_size(field_type), 16)
+            else:
+                if field_type not in STD140_TYPES:
+                    raise ValueError(f"Unknown GLSL type: {field_type}")
+                glsl_type = field_type
+                _, align, stride = STD140_TYPES[field_type]
+                if length is not None:
+                    align = 16
+                    stride = align_up(stride, 16)
+
+            offset = align_up(offset, align)
+            path = prefix + name
+            for index in range(length or 1):
+                element_path = path if length is None else f"{path}[{index}]"
+                element_offset = offset + index * stride
+                if leaves is None:
+                    continue
+                if isinstance(field_type, UniformStruct):
+                    self.add_fields(
+                        field_type.fields,
+                        element_path + ".",
+                        element_offset,
+                        [],
+                        leaves,
+                    )
+                else:
+                    leaves[element_path] = UniformField(element_offset, glsl_type)
+
+            array_suffix = "" if length is None else f"[{length}]"
+            layout.append(f"{glsl_type} {name}{array_suffix};")
+            offset += stride * (length or 1)
+        return offset
+
+    def struct_size(self, uniform_struct: UniformStruct) -> int:
+        if uniform_struct.name not in self.structs:
+            layout = []
+            size = self.add_fields(uniform_struct.fields, "", 0, layout, None)
+            self.structs[uniform_struct.name] = (layout, size)
+        return self.structs[uniform_struct.name][1]
+
+    @property
+    def glsl_source(self) -> str:
+        structs = "".join(
+            f"struct {name} {{{' '.join(layout)}}};\n"
+            for name, (layout, _) in self.structs.items()
+        )
+        members = " ".join(self.layout) if self.layout else "float dummy;"
+        return f"{structs}layout (std140) uniform {self.name} {{{members}}};"
+
+    def __setitem__(self, name: str, value):
+        field = self.fields[name]
+        value = value if field.is_scalar else tuple(value)
+        if self.values.get(name) == value:
+            return
+        self.values[name] = value
+        if field.is_scalar:
+            field.format.pack_into(self.data, field.offset, value)
+        else:
+            field.format.pack_into(self.data, field.offset, *value)
+        self.dirty_start = min(self.dirty_start, field.offset)
+        self.dirty_end = max(self.dirty_end, field.offset + field.size)
+
+    def __getitem__(self, name: str):
+        field = self.fields[name]
+        value = field.format.unpack_from(self.data, field.offset)
+        return value[0] if field.is_scalar else value
+
+    def upload(self, buffer) -> int:
+        if self.dirty_start >= self.dirty_end:
+            return 0
+        size = self.dirty_end - self.dirty_start
+        buffer.write(
+            memoryview(self.data)[self.dirty_start : self.dirty_end],
+            offset=self.dirty_start,
+        )
+        self.dirty_start = self.size
+        self.dirty_end = 0
+        return size
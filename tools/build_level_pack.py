@@ -0,0 +1,67 @@
+import argparse
+import datetime
+import os
+import time
+
+import src.constants as constants
+from src.headless import HeadlessApp
+from src.level import Level
+from src.level_pack import daily_pack_path, daily_seed, write_level_pack
+
+
+def build_levels(seed: int, screen_size: tuple[int, int]) -> list[Level]:
+    app = HeadlessApp(seed=seed, screen_size=screen_size)
+    game = app.game
+    levels = []
+    seen_facts = set()
+    for index, difficulty in enumerate(game.campaign_difficulties()):
+        game.constellations_completed = index
+        key = game.level_key(*difficulty)
+        level = game.generate_level(key, game.next_level_seed(), frozenset(seen_facts))
+        level.stars.init_reference_instances()
+        seen_facts.add(level.fact)
+        levels.append(level)
+    return levels
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Generate a campaign offline and write it as a level pack"
+    )
+    parser.add_argument(
+        "--date",
+        type=datetime.date.fromisoformat,
+        default=datetime.date.today(),
+        help="build the daily pack for this date (YYYY-MM-DD), default today",
+    )
+    parser.add_argument("--seed", type=int, help="campaign seed instead of the date")
+    parser.add_argument(
+        "--size",
+        metavar="WxH",
+        type=lambda value: tuple(int(n) for n in value.lower().split("x")),
+        default=constants.SCREEN_SIZE,
+        help="window size the pack is played at, default %(default)s",
+    )
+    parser.add_argument("--output", metavar="PATH", help="default: the daily pack")
+    args = parser.parse_args()
+
+    seed = daily_seed(args.date) if args.seed is None else args.seed
+    path = args.output or daily_pack_path(args.date)
+    start = time.perf_counter()
+    levels = build_levels(seed, args.size)
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    write_level_pack(
+        path,
+        seed,
+        args.size,
+        constants.DENSE_SKY_STARS,
+        constants.PROCEDURAL_STARS,
+        levels,
+    )
+    elapsed = time.perf_counter() - start
+    print(f"{len(levels)} levels in {elapsed:.2f} s")
+    print(f"{path}: {os.path.getsize(path)} bytes")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,248 @@
+import argparse
+import json
+import multiprocessing
+import os
+import sys
+import time
+
+import src.constants as constants
+from src.game import Game
+from src.headless import HeadlessApp
+from src.starfield import FLOATS_PER_STAR
+
+LEVELS = 1_000_000
+SHARD_SIZE = 5_000
+EXAMPLES = 5
+VIOLATIONS = ("off_screen", "under_panel", "rect_size", "star_shortfall")
+# get_rect_from_points sizes every rect as max + min, so --strict leaves this
+# out until the generator is fixed, the report still counts it
+KNOWN_VIOLATIONS = ("rect_size",)
+
+worker_game: Game | None = None
+
+
+class StepStats:
+    def __init__(self):
+        self.levels = 0
+        self.counts = dict.fromkeys((*VIOLATIONS, "overlap"), 0)
+        self.examples = {name: [] for name in self.counts}
+        self.requested_stars = 0
+        self.placed_stars = 0
+        self.min_star_ratio = 1.0
+        self.overlapping_stars = 0
+        self.times_us = []
+
+    def count(self, name: str, step: int, seed: int):
+        self.counts[name] += 1
+        if len(self.examples[name]) < EXAMPLES:
+            self.examples[name].append((step, seed))
+
+    def merge(self, other: "StepStats"):
+        self.levels += other.levels
+        for name, count in other.counts.items():
+            self.counts[name] += count
+            examples = self.examples[name]
+            examples.extend(other.examples[name][: EXAMPLES - len(examples)])
+        self.requested_stars += other.requested_stars
+        self.placed_stars += other.placed_stars
+        self.min_star_ratio = min(self.min_star_ratio, other.min_star_ratio)
+        self.overlapping_stars += other.overlapping_stars
+        self.times_us.extend(other.times_us)
+
+    def percentiles(self) -> tuple[float, float, float, float]:
+        ordered = sorted(self.times_us)
+        last = len(ordered) - 1
+        return tuple(ordered[round(last * q)] for q in (0.5, 0.95, 0.99, 1.0))
+
+    def report(self) -> dict:
+        return {
+            "levels": self.levels,
+            "counts": self.counts,
+            "example_seeds": self.examples,
+            "requested_stars": self.requested_stars,
+            "placed_stars": self.placed_stars,
+            "min_star_ratio": self.min_star_ratio,
+            "overlapping_stars": self.overlapping_stars,
+            "generation_us": dict(
+                zip(("p50", "p95", "p99", "max"), self.percentiles())
+            ),
+        }
+
+
+def init_worker(screen_size: tuple[int, int]):
+    global worker_game
+    worker_game = HeadlessApp(screen_size=screen_size).game
+
+
+def check_level(
+    game: Game, step: int, difficulty: tuple[int, int], seed: int, stats: StepStats
+):
+    game.constellations_completed = step
+    key = game.level_key(*difficulty)
+    start = time.perf_counter()
+    stars = game.generate_level(key, seed, frozenset()).stars
+    stats.times_us.append((time.perf_counter() - start) * 1e6)
+    stats.levels += 1
+
+    points = stars.constellation_points
+    xs = [x for x, _ in points]
+    ys = [y for _, y in points]
+    # a star is drawn up to its radius around its point
+    area = stars.star_area.inflate(
+        -2 * stars.star_max_radius, -2 * stars.star_max_radius
+    )
+    if min(xs) < area.left or max(xs) >= area.right or min(ys) < area.top:
+        stats.count("off_screen", step, seed)
+    if max(ys) >= area.bottom:
+        stats.count("under_panel", step, seed)
+    rect = stars.constellation_rect
+    if abs(rect.w - (max(xs) - min(xs))) > 1 or abs(rect.h - (max(ys) - min(ys))) > 1:
+        stats.count("rect_size", step, seed)
+
+    if constants.PROCEDURAL_STARS:
+        star_data = stars.procedural_star_data()
+        # stars that ran out of attempts are drawn with zero brightness
+        placed = [
+            (x, y)
+            for x, y, brightness in zip(
+                star_data[0::4], star_data[1::4], star_data[2::4]
+            )
+            if brightness
+        ]
+    else:
+        star_data = stars.instance_data[len(points) * FLOATS_PER_STAR :]
+        placed = list(zip(star_data[0::FLOATS_PER_STAR], star_data[1::FLOATS_PER_STAR]))
+    stats.requested_stars += stars.num_random_points
+    stats.placed_stars += len(placed)
+    ratio = len(placed) / stars.num_random_points
+    stats.min_star_ratio = min(stats.min_star_ratio, ratio)
+    if ratio < 1:
+        stats.count("star_shortfall", step, seed)
+
+    # background stars this close to a constellation star make the shape ambiguous
+    min_distance_sq = (2 * stars.star_max_radius) ** 2
+    overlapping = sum(
+        any((x - px) ** 2 + (y - py) ** 2 < min_distance_sq for px, py in points)
+        for x, y in placed
+    )
+    if overlapping:
+        stats.overlapping_stars += overlapping
+        stats.count("overlap", step, seed)
+
+
+def validate_shard(shard: tuple[int, int, int]) -> dict[int, StepStats]:
+    # level n is campaign step n % steps with a seed derived from n, so shards
+    # can run in any order and a reported seed regenerates its level
+    first_level, count, seed = shard
+    difficulties = worker_game.campaign_difficulties()
+    stats = {}
+    for level in range(first_level, first_level + count):
+        step = level % len(difficulties)
+        check_level(
+            worker_game,
+            step,
+            difficulties[step],
+            seed * 1_000_003 + level,
+            stats.setdefault(step, StepStats()),
+        )
+    return stats
+
+
+def print_report(stats: dict[int, StepStats], total: StepStats, elapsed: float):
+    print(
+        f"\n{'step':>4} {'levels':>9} {'off screen':>10} {'under panel':>11}"
+        f" {'rect size':>9} {'overlap':>8} {'stars':>7} {'p50 us':>8} {'p99 us':>8}"
+    )
+    for step, step_stats in [*stats.items(), ("all", total)]:
+        counts = step_stats.counts
+        levels = step_stats.levels
+        p50, _, p99, _ = step_stats.percentiles()
+        print(
+            f"{step:>4} {levels:>9}"
+            f" {counts['off_screen'] / levels:>10.2%}"
+            f" {counts['under_panel'] / levels:>11.2%}"
+            f" {counts['rect_size'] / levels:>9.2%}"
+            f" {counts['overlap'] / levels:>8.2%}"
+            f" {step_stats.placed_stars / step_stats.requested_stars:>7.2%}"
+            f" {p50:>8.1f} {p99:>8.1f}"
+        )
+    print(
+        f"\n{total.levels} levels in {elapsed:.1f} s ({total.levels / elapsed:.0f}/s)"
+    )
+    for name in VIOLATIONS:
+        if total.counts[name]:
+            examples = ", ".join(
+                f"step {step} seed {seed}" for step, seed in total.examples[name]
+            )
+            known = " (known, not checked by --strict)" * (name in KNOWN_VIOLATIONS)
+            print(f"{name}{known}: {total.counts[name]} levels, e.g. {examples}")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Generate levels across every campaign step in parallel and "
+        "report layout problems"
+    )
+    parser.add_argument("--levels", type=int, default=LEVELS)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--shard-size", type=int, default=SHARD_SIZE)
+    parser.add_argument(
+        "--size",
+        metavar="WxH",
+        type=lambda value: tuple(int(n) for n in value.lower().split("x")),
+        default=constants.SCREEN_SIZE,
+        help="window size to generate levels for, default %(default)s",
+    )
+    parser.add_argument("--output", metavar="PATH", help="save the report as JSON")
+    parser.add_argument(
+        "--strict",
+        action="store_true",
+        help="exit with an error on any violation except known generator defects",
+    )
+    args = parser.parse_args()
+
+    shards = [
+        (first_level, min(args.shard_size, args.levels - first_level), args.seed)
+        for first_level in range(0, args.levels, args.shard_size)
+    ]
+    stats = {}
+    start = time.perf_counter()
+    with multiprocessing.Pool(
+        args.workers, initializer=init_worker, initargs=(args.size,)
+    ) as pool:
+        for done, shard_stats in enumerate(
+            pool.imap_unordered(validate_shard, shards), 1
+        ):
+            for step, step_stats in shard_stats.items():
+                stats.setdefault(step, StepStats()).merge(step_stats)
+            print(f"\rshards {done}/{len(shards)}", end="", flush=True)
+    elapsed = time.perf_counter() - start
+    stats = dict(sorted(stats.items()))
+    total = StepStats()
+    for step_stats in stats.values():
+        total.merge(step_stats)
+    print_report(stats, total, elapsed)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(
+                {
+                    "seed": args.seed,
+                    "screen_size": args.size,
+                    "dense_sky_stars": constants.DENSE_SKY_STARS,
+                    "procedural_stars": constants.PROCEDURAL_STARS,
+                    "total": total.report(),
+                    "steps": {step: s.report() for step, s in stats.items()},
+                },
+                f,
+                indent=2,
+            )
+    if args.strict and any(
+        total.counts[name] for name in VIOLATIONS if name not in KNOWN_VIOLATIONS
+    ):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()